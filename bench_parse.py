@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Micro-benchmarks for the wells_preprocessing parser stages.
+# Uses a synthetic multi-hundred-page well file by default, or real PDFs via --pdf.
+#
+#   python3 bench_parse.py --pages 500
+#   python3 bench_parse.py --pdf ./DSCI560_Lab5/W28190.pdf
+
+import argparse, random, time, tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+import wells_preprocessing as wp
+
+FILLER = [
+    "The well was drilled to total depth and logged with a triple combo suite.",
+    "Operator reports no unusual conditions during the reporting period.",
+    "Casing was run and cemented to surface with full returns observed.",
+    "Section 12 Township 153 N Range 101 W McKenzie County North Dakota",
+    "Mud weight 9.8 ppg, viscosity 45 sec, no losses recorded while drilling.",
+    "Daily report continued on following page.",
+]
+LABELED = [
+    "Operator: Continental Resources Inc",
+    "Well Name and Number: Atlanta 14-6H",
+    "API No: 33-053-06057",
+    "Field Address: 20 N Broadway, Oklahoma City, OK 73102",
+    "Date Stimulated: 05/14/2015",
+    "Stimulated Formation: Bakken",
+    "Top (ft): 11250",
+    "Bottom (ft): 20980",
+    "Stimulation Stages: 36",
+    "Total Volume: 125,430 bbls",
+    "Acid %: 15",
+    "Lbs Proppant: 4,500,000",
+    "Maximum Treatment Pressure (PSI): 8450",
+    "Maximum Treatment Rate (BBLS/Min): 80.5",
+    "Latitude 48° 03' 31.52\" N  Longitude 103° 36' 46.11\" W",
+    "Hydraulic fracture treatment pumped in 36 stages at 80 BPM and 8450 psi.",
+]
+
+def synthetic_pages(n_pages: int, lines_per_page: int = 60, seed: int = 0) -> List[str]:
+    rnd = random.Random(seed)
+    pages = []
+    for p in range(n_pages):
+        lines = []
+        for _ in range(lines_per_page):
+            # labels are rare and mostly late, like attachments after a long drilling log
+            if rnd.random() < 0.01 + 0.02 * (p / max(1, n_pages)):
+                lines.append(rnd.choice(LABELED))
+            else:
+                lines.append(rnd.choice(FILLER) + f" {rnd.randint(0, 99999)}")
+        pages.append("\n".join(lines))
+    return pages
+
+def timeit(fn: Callable, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def bench_labels(pages: List[str], repeat: int) -> None:
+    lines = wp.page_lines("\n".join(pages))
+    pats = {k: wp.LP[k] for k in wp.SCAN_FIELDS}
+
+    def per_field():
+        return {k: wp.extract_value_near_label(lines, p)[0] for k, p in pats.items()}
+
+    def single_pass():
+        return wp.scan_labels(lines, pats)
+
+    t_old, a = timeit(per_field, repeat)
+    t_new, b = timeit(single_pass, repeat)
+    assert a == b, f"label scan mismatch:\n{a}\n{b}"
+    print(f"labels      per-field {t_old*1000:9.1f} ms   single-pass {t_new*1000:9.1f} ms   "
+          f"x{t_old / t_new if t_new else float('inf'):.1f}   ({len(lines)} lines)")
+
+def _pair_reference(cands):
+    # The original all-pairs-in-a-±25-window loop, kept as the reference for bench_coords
+    best = (None, None, -1.0)
+    for i, a in enumerate(cands):
+        for j in range(max(0, i-25), min(len(cands), i+26)):
+            b = cands[j]
+            if a["is_lat"] == b["is_lat"]:
+                continue
+            dist = abs(a["pos"] - b["pos"])
+            score = (a["quality"] + b["quality"]) * 10 + (2 if a["nd_pref"] else 0) \
+                + (2 if b["nd_pref"] else 0) + max(0, 1200 - dist) / 1200.0
+            if score > best[2]:
+                lat_raw = a["raw"] if a["is_lat"] else b["raw"]
+                lon_raw = b["raw"] if a["is_lat"] else a["raw"]
+                if wp._hemi_status(lat_raw) not in ("LAT", "NONE"): continue
+                if wp._hemi_status(lon_raw) not in ("LON", "NONE"): continue
+                best = (lat_raw, lon_raw, score)
+    return best[:2]
+
+def bench_coords(pages: List[str], repeat: int) -> None:
+    t = wp._norm_minus("\n".join(pages))
+
+    def full_scan():
+        return [wp.DMS_FLEX.finditer(t), wp.DEC_ANY.finditer(t)]
+
+    def span_scan():
+        dms, dec = wp._coord_spans(t)
+        return [wp._finditer_spans(wp.DMS_FLEX, t, dms), wp._finditer_spans(wp.DEC_ANY, t, dec)]
+
+    def kept(scans):
+        # hemisphere-less DMS hits are discarded by the collector, so only compare the rest
+        dms, dec = (list(x) for x in scans)
+        return ([m.span() for m in dms if m.group("h1") or m.group("h3")], [m.span() for m in dec])
+
+    t_old, a = timeit(lambda: kept(full_scan()), repeat)
+    t_new, b = timeit(lambda: kept(span_scan()), repeat)
+    assert a == b, "coordinate regex matches differ"
+    print(f"coord-scan  full-text {t_old*1000:9.1f} ms   prefiltered {t_new*1000:9.1f} ms   "
+          f"x{t_old / t_new if t_new else float('inf'):.1f}   ({len(a[0]) + len(a[1])} matches)")
+
+    cands = wp._collect_coord_candidates_with_pos(t)
+    t_old, a = timeit(lambda: _pair_reference(cands), repeat)
+    t_new, b = timeit(lambda: wp._pick_lat_lon(cands), repeat)
+    assert a == b or a[0] is None, f"coordinate pair differs: {a} vs {b}"
+    print(f"coord-pair  window    {t_old*1000:9.1f} ms   sliding     {t_new*1000:9.1f} ms   "
+          f"x{t_old / t_new:.1f}   ({len(cands)} candidates)")
+
+def bench_stream(pages: List[str], repeat: int) -> None:
+    # Peak Python heap while parsing: whole document in a list vs pages pulled from a generator.
+    # The generator re-creates each page on demand, like iter_text_pages does from the PDF.
+    def peak(make_pages):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        rec = wp.parse_pages(make_pages())
+        secs = time.perf_counter() - t0
+        _, top = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return top, secs, rec
+
+    # encode/decode forces a fresh copy of each page so the list really holds the whole text
+    m_list, t_list, a = peak(lambda: [p.encode().decode() for p in pages])
+    m_gen, t_gen, b = peak(lambda: (p.encode().decode() for p in pages))
+    assert a == b, "streamed parse differs"
+    print(f"stream      list {m_list / 2**20:7.1f} MiB {t_list*1000:8.1f} ms   "
+          f"generator {m_gen / 2**20:7.1f} MiB {t_gen*1000:8.1f} ms")
+
+BENCHES = {"labels": bench_labels, "coords": bench_coords, "stream": bench_stream}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=500, help="Synthetic document length")
+    ap.add_argument("--pdf", nargs="*", help="Benchmark real PDFs instead of a synthetic document")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--only", choices=sorted(BENCHES), nargs="*", help="Run only these benchmarks")
+    args = ap.parse_args()
+
+    docs = [(f"synthetic x{args.pages}", synthetic_pages(args.pages))] if not args.pdf else \
+           [(p, wp.extract_text_pages(Path(p))) for p in args.pdf]
+    for name, pages in docs:
+        print(f"== {name} ({len(pages)} pages)")
+        for key in (args.only or BENCHES):
+            BENCHES[key](pages, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# One MySQL connection pool per process, shared by db_utils, wells_preprocessing and the webapp.
+# Credentials come from the MYSQL_* variables (preprocessing/webapp), falling back to the
+# DB_* names db_utils used.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))   # seconds to wait when every connection is busy
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def _env(name, default=None):
+    return os.getenv("MYSQL_" + name) or os.getenv("DB_" + name) or default
+
+
+def db_config():
+    return {
+        "host": _env("HOST", "localhost"),
+        "port": int(_env("PORT", "3306")),
+        "user": _env("USER"),
+        "password": _env("PASSWORD"),
+        "database": os.getenv("MYSQL_DB") or os.getenv("DB_NAME") or "wells_db",
+    }
+
+
+def get_pool(**extra):
+    """The pool for this process; connect flags in `extra` (e.g. allow_local_infile) get their own."""
+    key = (os.getpid(), tuple(sorted(extra.items())))     # a forked child must not reuse the parent's sockets
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = pooling.MySQLConnectionPool(
+                pool_name=f"wells_{os.getpid()}_{len(_pools)}",
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=True,
+                **db_config(),
+                **extra,
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_connection(autocommit=False, **extra):
+    """Borrow a pooled connection; close() hands it back. Waits up to DB_POOL_TIMEOUT if none is free."""
+    pool = get_pool(**extra)
+    deadline = time.monotonic() + DB_POOL_TIMEOUT
+    while True:
+        try:
+            conn = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+    try:
+        # health check: a connection the server dropped while idle is reconnected here, not at first use
+        conn.ping(reconnect=True, attempts=2, delay=0.2)
+        # PooledMySQLConnection has no __setattr__: setting autocommit on the wrapper would never reach
+        # the server, so it is set on the underlying connection (the session reset on close() undoes it)
+        getattr(conn, "_cnx", conn).autocommit = autocommit
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+@contextmanager
+def connection(commit=False, **extra):
+    """with connection(commit=True) as conn: ...  -- commits on success, rolls back on error."""
+    conn = get_connection(**extra)
+    try:
+        yield conn
+        if commit:
+            conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except mysql.connector.Error:
+            pass
+        raise
+    finally:
+        conn.close()
@@ -1,57 +1,215 @@
-import mysql.connector
-import os
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
-
-def get_connection():
-    conn = mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME")
-    )
-    return conn
+# Connections come from the shared pool in db_pool; close() hands them back instead of disconnecting
+from db_pool import connection
 
 def fetch_wells(limit=None):
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
+    with connection() as conn:
+        cursor = conn.cursor(dictionary=True)
     
-    query = "SELECT api_number, well_name_number From wells"
-    if limit:
-        query += f" LIMIT {limit}"
-    cursor.execute(query)
-    results = cursor.fetchall()
+        query = "SELECT id, api_number, well_name_number From wells"
+        if limit:
+            query += f" LIMIT {limit}"
+        cursor.execute(query)
+        results = cursor.fetchall()
     
-    conn.close()
     return results
 
 def update_well(api_number, well_name, data):
-    conn = get_connection()
-    cursor = conn.cursor()
+    ensure_indexes()
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
     
-    query = """
-        UPDATE wells
-        SET status=%s, type=%s, city=%s,
-            lat=%s, lon=%s,
-            oil_bbl=%s, oil_desc=%s,
-            gas_bbl=%s, gas_desc=%s
-        WHERE well_name_number=%s
-    """
+        query = """
+            UPDATE wells
+            SET status=%s, type=%s, city=%s,
+                lat=%s, lon=%s,
+                oil_bbl=%s, oil_desc=%s,
+                gas_bbl=%s, gas_desc=%s
+            WHERE well_name_number=%s
+        """
     
-    values = (
-        data["status"],
-        data["type"],
-        data["city"],
-        data["lat"],
-        data["lon"],
-        data["oil_bbl"],
-        data["oil_desc"],
-        data["gas_bbl"],
-        data["gas_desc"],
-        well_name
-    )
-
-    cursor.execute(query, values)
-    conn.commit()
-    conn.close()
\ No newline at end of file
+        values = (
+            data["status"],
+            data["type"],
+            data["city"],
+            data["lat"],
+            data["lon"],
+            data["oil_bbl"],
+            data["oil_desc"],
+            data["gas_bbl"],
+            data["gas_desc"],
+            well_name
+        )
+
+        cursor.execute(query, values)
+
+ENRICH_COLS = ["status", "type", "city", "lat", "lon", "oil_bbl", "oil_desc", "gas_bbl", "gas_desc"]
+# indexes the update/lookup paths rely on; wells_schema.sql creates them on fresh installs
+WELL_INDEXES = {"idx_wells_api": "api_number", "idx_wells_name": "well_name_number"}
+_indexes_checked = False
+_indexes_lock = threading.Lock()
+
+def ensure_indexes():
+    """Add the WELL_INDEXES missing from an existing wells table (once per process, thread-safe)."""
+    global _indexes_checked
+    if _indexes_checked:
+        return
+    with _indexes_lock:
+        if not _indexes_checked:
+            _add_missing_indexes()
+            _indexes_checked = True
+
+def _add_missing_indexes():
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT DISTINCT index_name FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = 'wells'"
+        )
+        have = {r[0] for r in cursor.fetchall()}
+        for name, col in WELL_INDEXES.items():
+            if name not in have:
+                cursor.execute(f"ALTER TABLE wells ADD INDEX {name} ({col})")
+
+def update_wells(records, chunk=1000):
+    """Bulk update_well: records are (api_number, well_name, data) tuples.
+
+    Stages the rows in a temporary table and applies them with one UPDATE ... JOIN, all in a
+    single transaction. Same matching as update_well (by well_name_number; the last record
+    for a name wins, records without a name are skipped). Returns the number of wells rows changed.
+    """
+    rows = {}
+    for api_number, well_name, data in records:
+        if not well_name:
+            continue    # matched by name, so a nameless record has no row (update_well did nothing for it either)
+        rows[well_name] = (well_name, *(data[c] for c in ENRICH_COLS))
+    if not rows:
+        return 0
+    ensure_indexes()
+    changed, _ = _stage_and_update("well_name_number", "VARCHAR(255)", list(rows.values()), chunk)
+    return changed
+
+def update_wells_by_id(records, chunk=1000):
+    """update_wells keyed by wells.id: records are (id, data) tuples; records without an id are skipped.
+    Returns the set of ids that matched a wells row (whether or not any value changed)."""
+    rows = {}
+    for well_id, data in records:
+        if well_id is not None:
+            rows[int(well_id)] = (int(well_id), *(data[c] for c in ENRICH_COLS))
+    if not rows:
+        return set()
+    _, matched = _stage_and_update("id", "BIGINT UNSIGNED", list(rows.values()), chunk, report_matched=True)
+    return matched
+
+def _stage_and_update(key, key_type, vals, chunk, report_matched=False):
+    # vals: (key, *ENRICH_COLS) tuples -> (rows changed, keys that matched a row if report_matched)
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS wells_enrich_tmp")
+        cursor.execute(f"""
+            CREATE TEMPORARY TABLE wells_enrich_tmp (
+              {key} {key_type} PRIMARY KEY,
+              status VARCHAR(50), type VARCHAR(50), city VARCHAR(100),
+              lat DECIMAL(10,6), lon DECIMAL(10,6),
+              oil_bbl INT, oil_desc VARCHAR(255),
+              gas_bbl INT, gas_desc VARCHAR(255)
+            )
+        """)
+        insert = (f"INSERT INTO wells_enrich_tmp ({key}, {', '.join(ENRICH_COLS)}) "
+                  f"VALUES ({', '.join(['%s'] * (len(ENRICH_COLS) + 1))})")
+        for i in range(0, len(vals), chunk):
+            cursor.executemany(insert, vals[i:i + chunk])
+        cursor.execute(
+            f"UPDATE wells w JOIN wells_enrich_tmp t ON w.{key} = t.{key} SET "
+            + ", ".join(f"w.{c} = t.{c}" for c in ENRICH_COLS)
+        )
+        changed = cursor.rowcount
+        matched = None
+        if report_matched:
+            # rowcount only counts rows whose values changed; a re-scrape with the same data still counts
+            cursor.execute(f"SELECT t.{key} FROM wells_enrich_tmp t JOIN wells w ON w.{key} = t.{key}")
+            matched = {r[0] for r in cursor.fetchall()}
+        cursor.execute("DROP TEMPORARY TABLE wells_enrich_tmp")
+    return changed, matched
+
+
+# ---- Checkpointed runs: which wells a run has finished, so an interrupted run can resume ----
+
+def well_key(api_number, well_name):
+    return f"{api_number or ''}|{well_name or ''}"
+
+def ensure_checkpoint_tables():
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_runs (
+              run_id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+              started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+              finished_at TIMESTAMP NULL DEFAULT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_run_wells (
+              run_id INT UNSIGNED NOT NULL,
+              well_key VARCHAR(300) NOT NULL,
+              api_number VARCHAR(32),
+              well_name_number VARCHAR(255),
+              state ENUM('pending','done','failed','not_found') NOT NULL DEFAULT 'pending',
+              attempts INT NOT NULL DEFAULT 0,
+              last_error TEXT,
+              updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+              PRIMARY KEY (run_id, well_key),
+              KEY idx_run_state (run_id, state)
+            )
+        """)
+
+def start_run():
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO scrape_runs () VALUES ()")
+        run_id = cursor.lastrowid
+    return run_id
+
+def latest_run(unfinished_only=True):
+    with connection() as conn:
+        cursor = conn.cursor()
+        query = "SELECT run_id FROM scrape_runs"
+        if unfinished_only:
+            query += " WHERE finished_at IS NULL"
+        cursor.execute(query + " ORDER BY run_id DESC LIMIT 1")
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+def add_run_wells(run_id, wells):
+    # INSERT IGNORE: on resume, wells already in the run keep their state
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT IGNORE INTO scrape_run_wells (run_id, well_key, api_number, well_name_number) "
+            "VALUES (%s, %s, %s, %s)",
+            [(run_id, well_key(w.get("api_number"), w.get("well_name_number")),
+              w.get("api_number"), w.get("well_name_number")) for w in wells],
+        )
+
+def run_states(run_id):
+    """{well_key: (state, attempts)} for every well in the run."""
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT well_key, state, attempts FROM scrape_run_wells WHERE run_id=%s", (run_id,))
+        states = {k: (s, a) for k, s, a in cursor.fetchall()}
+    return states
+
+def mark_run_well(run_id, key, state, attempts=0, error=None):
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE scrape_run_wells SET state=%s, attempts=attempts+%s, last_error=%s "
+            "WHERE run_id=%s AND well_key=%s",
+            (state, attempts, error, run_id, key),
+        )
+
+def finish_run(run_id):
+    with connection(commit=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE scrape_runs SET finished_at=CURRENT_TIMESTAMP WHERE run_id=%s", (run_id,))
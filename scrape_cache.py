@@ -0,0 +1,85 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from scraper import normalize_name
+
+# Local cache of DrillingEdge lookups: the raw detail page plus the parsed search_well dict.
+SCRAPE_CACHE_PATH = os.getenv("SCRAPE_CACHE_PATH", os.path.expanduser("~/.cache/wells_scrape.sqlite3"))
+SCRAPE_CACHE_TTL_HOURS = float(os.getenv("SCRAPE_CACHE_TTL_HOURS", "72"))
+# "not found" answers are cached too, but re-checked sooner
+SCRAPE_CACHE_MISS_TTL_HOURS = float(os.getenv("SCRAPE_CACHE_MISS_TTL_HOURS", "24"))
+
+
+def cache_key(api_number, well_name):
+    """api:<10 digits> when the API number is usable, else name:<normalized well name>."""
+    digits = re.sub(r"\D", "", api_number or "")
+    if len(digits) >= 10:
+        return "api:" + digits[:10]
+    name = normalize_name(well_name)
+    return "name:" + name if name else None
+
+
+class ScrapeCache:
+    """SQLite-backed, thread-safe. lookup() reports whether an entry is still within its TTL."""
+
+    def __init__(self, path=SCRAPE_CACHE_PATH, ttl_hours=SCRAPE_CACHE_TTL_HOURS,
+                 miss_ttl_hours=SCRAPE_CACHE_MISS_TTL_HOURS):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl_hours * 3600
+        self.miss_ttl = miss_ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                key TEXT PRIMARY KEY,
+                result_json TEXT,
+                html TEXT,
+                url TEXT,
+                fetched_at REAL NOT NULL
+            )""")
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, key):
+        """None if never fetched, else {"result", "html", "url", "fetched_at", "age", "fresh"}.
+        result is None for a cached "not found"."""
+        if not key:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result_json, html, url, fetched_at FROM scrape_cache WHERE key=?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0]) if row[0] else None
+        age = time.time() - row[3]
+        return {
+            "result": result, "html": row[1], "url": row[2], "fetched_at": row[3], "age": age,
+            "fresh": age < (self.ttl if result is not None else self.miss_ttl),
+        }
+
+    def store(self, key, result, html=None, url=None):
+        if not key:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache (key, result_json, html, url, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(result) if result is not None else None, html, url, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
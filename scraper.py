@@ -10,6 +10,15 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchWindowException, TimeoutException,
+                                        WebDriverException)
+from contextlib import contextmanager
+from collections import deque
+from urllib.parse import urlparse
+import os
+import queue
+import random
+import threading
 import time
 
 def normalize_name(name:str) -> str:
@@ -21,160 +30,603 @@ def normalize_name(name:str) -> str:
 
 
 BASE_URL = "https://www.drillingedge.com/search"
+CHROMEDRIVER = "/usr/bin/chromedriver"
 
+# Politeness: page loads per second per host, shared by every thread and both engines
+SCRAPE_RATE = float(os.getenv("SCRAPE_RATE", "2"))
+SCRAPE_BURST = int(os.getenv("SCRAPE_BURST", "4"))
 
-def search_well(api_number, well_name, headless=True):
-    if not api_number and not well_name:
-        print("Missing both api_number and well_name, skip search.")
-        return None
-    
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, up to `burst` back to back."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # take a token now (possibly going negative) and sleep off the debt outside the lock,
+        # so concurrent callers queue up in arrival order without busy-waiting
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.t) * self.rate)
+            self.t = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def rate_limit(url):
+    """Block until the host of `url` may be hit again."""
+    if SCRAPE_RATE <= 0:
+        return
+    host = urlparse(url).netloc
+    with _buckets_lock:
+        b = _buckets.get(host)
+        if b is None:
+            b = _buckets[host] = TokenBucket(SCRAPE_RATE, SCRAPE_BURST)
+    b.acquire()
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    # exponential backoff with full jitter
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def make_driver(headless=True):
     options = Options()
     if headless:
         options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-        
-    driver = webdriver.Chrome(service=Service("/usr/bin/chromedriver"), options=options)
-    
+    return webdriver.Chrome(service=Service(CHROMEDRIVER), options=options)
+
+
+class DriverPool:
+    """Keeps up to `size` warm Chrome instances and lends them out one search at a time.
+
+    with DriverPool(size=2) as pool:
+        with pool.driver() as d:
+            search_well(api, name, driver=d)
+
+    A driver is reset (cookies cleared, blank page) when it comes back, and quit and replaced
+    after `max_uses` searches or when it crashed (lost its session, or stops responding after an
+    error) / fails the reset. A timeout alone doesn't retire it.
+    """
+
+    def __init__(self, size=1, headless=True, max_uses=50):
+        self.size = max(1, size)
+        self.headless = headless
+        self.max_uses = max_uses
+        self._idle = queue.LifoQueue()      # most recently used first: its page cache is warm
+        self._uses = {}
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                grow = self._created < self.size
+                if grow:
+                    self._created += 1
+            if grow:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise queue.Empty
+            try:
+                # short waits: a discarded driver frees a slot without putting anything back
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        try:
+            d = make_driver(self.headless)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        self._uses[id(d)] = 0
+        return d
+
+    def release(self, d, broken=False):
+        uses = self._uses.get(id(d), 0) + 1
+        self._uses[id(d)] = uses
+        if not broken and uses < self.max_uses:
+            try:
+                d.delete_all_cookies()
+                d.get("about:blank")
+                self._idle.put(d)
+                return
+            except WebDriverException:
+                pass
+        self._discard(d)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        d = self.acquire(timeout)
+        broken = False
+        try:
+            yield d
+        except TimeoutException:
+            raise                   # the page was slow, the browser is fine
+        except (InvalidSessionIdException, NoSuchWindowException):
+            broken = True
+            raise
+        except WebDriverException:
+            broken = not self._alive(d)
+            raise
+        finally:
+            self.release(d, broken)
+
+    @staticmethod
+    def _alive(d):
+        try:
+            d.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, d):
+        self._uses.pop(id(d), None)
+        try:
+            d.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._created -= 1
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+class LatencyTracker:
+    """Recent per-stage latencies; timeouts adapt to what the site has actually been doing."""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, secs):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.window)).append(secs)
+
+    def percentile(self, stage, q):
+        with self._lock:
+            vals = sorted(self._samples.get(stage, ()))
+        if not vals:
+            return None
+        return vals[min(len(vals) - 1, int(q / 100.0 * len(vals)))]
+
+    def timeout(self, stage, default, floor=2.0, ceil=30.0, min_samples=5):
+        # 3x the observed p95 once there are enough samples, clamped; `default` until then
+        with self._lock:
+            n = len(self._samples.get(stage, ()))
+        if n < min_samples:
+            return default
+        return max(floor, min(ceil, 3 * self.percentile(stage, 95)))
+
+    def summary(self):
+        with self._lock:
+            stages = list(self._samples)
+        out = {}
+        for st in stages:
+            with self._lock:
+                vals = list(self._samples[st])
+            out[st] = {"n": len(vals), "p50": self.percentile(st, 50), "p95": self.percentile(st, 95),
+                       "total": sum(vals)}
+        return out
+
+
+LATENCY = LatencyTracker()
+
+
+@contextmanager
+def timed(stage):
+    t0 = time.perf_counter()
     try:
+        yield
+    finally:
+        LATENCY.record(stage, time.perf_counter() - t0)
+
+
+NO_RESULTS_RX = re.compile(r"\b(?:no\s+(?:results|wells|records|matches)\b|0\s+results\b|nothing\s+found)", re.I)
+RESULT_LINKS = (By.CSS_SELECTOR, "table tr td a")
+# what results_or_empty returns for an empty search: WebDriverWait.until only stops on a truthy value
+NO_RESULTS = ("empty",)
+
+
+class results_or_empty:
+    """Wait condition racing "result links present" against "search came back empty".
+
+    Returns the links, or NO_RESULTS once the submitted page says there are no results, so an
+    empty search doesn't sit out the whole timeout before the API-number fallback. A loaded page
+    with neither keeps the wait going (the results table may still be rendering); `loaded` tells
+    a timeout on such a page apart from one that never loaded.
+    """
+
+    def __init__(self, old_page):
+        self.old_page = old_page    # <html> of the form page; stale once the results page replaced it
+        self.loaded = False
+
+    def __call__(self, driver):
+        links = driver.find_elements(*RESULT_LINKS)
+        if links:
+            return links
+        if self.old_page is not None:
+            try:
+                self.old_page.is_enabled()
+                return False            # still on the form page
+            except WebDriverException:
+                self.old_page = None
+        if driver.execute_script("return document.readyState") != "complete":
+            return False
+        body = driver.find_element(By.TAG_NAME, "body").text
+        self.loaded = True
+        return NO_RESULTS if NO_RESULTS_RX.search(body) else False
+
+
+def submit_search(driver, field, value):
+    """Load the search form, submit `field`=value, and return the result links ([] when the page
+    says there are none). Returns None when the results page loaded but showed neither links nor a
+    "no results" message before the timeout. Raises TimeoutException if it never finished loading."""
+    rate_limit(BASE_URL)    # outside timed(): a token-bucket wait isn't page latency
+    with timed("form_load"):
         driver.get(BASE_URL)
-        
-        
-        # find the search box
-        # Search by well_name
+        inp = WebDriverWait(driver, LATENCY.timeout("form_load", 10)).until(
+            EC.presence_of_element_located((By.NAME, field))
+        )
+    inp.clear()
+    inp.send_keys(value)
+    old_page = driver.find_element(By.TAG_NAME, "html")
+    rate_limit(BASE_URL)
+    t0 = time.perf_counter()
+    inp.send_keys(Keys.RETURN)
+    cond = results_or_empty(old_page)
+    try:
+        links = WebDriverWait(driver, LATENCY.timeout("search_results", 15), poll_frequency=0.1).until(cond)
+    except TimeoutException:
+        if cond.loaded:
+            return None     # inconclusive: not recorded, a timed-out wait isn't a latency sample
+        raise
+    if links is NO_RESULTS:
+        links = []
+    LATENCY.record("search_results" if links else "search_empty", time.perf_counter() - t0)
+    return links
+
+
+# Every th/td pair and block_stat of the detail page in one execute_script round trip
+EXTRACT_JS = """
+const data = [], stats = [];
+for (const row of document.querySelectorAll("table tr")) {
+  const ths = row.querySelectorAll("th"), tds = row.querySelectorAll("td");
+  for (let i = 0; i < Math.min(ths.length, tds.length); i++)
+    data.push([ths[i].innerText.trim(), tds[i].innerText.trim()]);
+}
+for (const p of document.querySelectorAll("p.block_stat")) {
+  const span = p.querySelector("span");
+  stats.push([p.innerText.trim(), span ? span.innerText.trim() : "0"]);
+}
+return {data: data, stats: stats};
+"""
+
+
+def _extract_with_script(driver):
+    out = driver.execute_script(EXTRACT_JS)
+    return dict(out["data"]), [tuple(x) for x in out["stats"]]
+
+
+def _extract_with_elements(driver):
+    # the original per-element reads: one WebDriver round trip per cell
+    rows = driver.find_elements(By.CSS_SELECTOR, "table tr")
+    data = {}
+    for row in rows:
+        ths = row.find_elements(By.TAG_NAME, "th")
+        tds = row.find_elements(By.TAG_NAME, "td")
+        for th, td in zip(ths, tds):
+            data[th.text.strip()] = td.text.strip()
+    stats = []
+    for stat in driver.find_elements(By.CSS_SELECTOR, "p.block_stat"):
         try:
-            well_input = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "well_name"))
-            )
-            well_input.clear()
-            well_input.send_keys(well_name)
-            well_input.send_keys(Keys.RETURN)
-            time.sleep(1.5)
-        
-            # Wait for the search results
-            links = WebDriverWait(driver, 15).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table tr td a"))
-            )
-        except:
-            links = []
+            span_val = stat.find_element(By.TAG_NAME, "span").text.strip()
+        except WebDriverException:
+            span_val = "0"
+        stats.append((stat.text.strip(), span_val))
+    return data, stats
+
+
+def build_result(data, stats):
+    """Result dict from the detail table (th -> td text) and block_stat (text, span text) pairs."""
+    # process lat and lon
+    lat, lon = None, None
+    if "Latitude / Longitude" in data:
+        coords = data["Latitude / Longitude"].split(",")
+        if len(coords) == 2:
+            try:
+                lat = float(coords[0].strip())
+            except:
+                lat = None
+            try:
+                lon = float(coords[1].strip())
+            except:
+                lon = None
+    
+    # Oil & Gas defaukt
+    oil_val, oil_desc = 0, "N/A"
+    gas_val, gas_desc = 0, "N/A"
+    
+    for text, span_val in stats:
+        num_str = span_val.replace(",", "").strip()
+        if "Oil Produced" in text:
+            oil_val = int(num_str) if num_str.isdigit() else 0
+            oil_desc = text
+        elif "Gas Produced" in text:
+            gas_val = int(num_str) if num_str.isdigit() else 0
+            gas_desc = text
+    
+    return {
+        "status": data.get("Well Status", "N/A"),
+        "type": data.get("Well Type", "N/A"),
+        "city": data.get("Closest City", "N/A"),
+        "lat": lat,
+        "lon": lon,
+        "oil_bbl": oil_val,
+        "oil_desc": oil_desc,
+        "gas_bbl": gas_val,
+        "gas_desc": gas_desc
+    }
+
+
+def search_well(api_number, well_name, headless=True, driver=None, raw=None, extract="html"):
+    # driver: a DriverPool driver to reuse; without one a browser is started and quit here
+    # raw: optional dict that receives the detail page's "html" and "url" (for the scrape cache),
+    #      or not_found=True when the search itself came back empty
+    # An empty result only counts as not found if the site said so; if a search was inconclusive
+    # (see submit_search) and nothing was found, TimeoutException is raised so it can be retried.
+    # extract: how the detail page is read -- "html" (page_source + BeautifulSoup),
+    #          "script" (one execute_script returning every cell), "elements" (per-cell WebDriver calls)
+    if not api_number and not well_name:
+        print("Missing both api_number and well_name, skip search.")
+        return None
+    
+    own_driver = driver is None
+    if own_driver:
+        driver = make_driver(headless)
+    
+    try:
+        # Search by well_name
+        links = submit_search(driver, "well_name", well_name) if well_name else []
+        inconclusive = links is None
         
         target_link = None
         
-        # name_norm = normalize_name(well_name)
-        # api_str = (api_number or "").strip()
-        
         if links:
             target_link = links[0]
             print(f"Found results for Well Name: {well_name}")
         else:
             # Fallback to API number
             if not api_number:
+                if inconclusive:
+                    raise TimeoutException(f"search for {well_name} showed no results or message")
                 print(f"No results for {well_name}, and no API number available.")
+                if raw is not None:
+                    raw["not_found"] = True
                 return None
             print(f"No result by Well Name -> retrying search with API number: {api_number}")
-            driver.get(BASE_URL)
             
-            try:
-                api_input = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.NAME, "api_no"))
-                )
-                api_input.clear()
-                api_input.send_keys(api_number)
-                api_input.send_keys(Keys.RETURN)
-                time.sleep(2.0)
-                
-                api_links = WebDriverWait(driver, 15).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "table tr td a"))
-                )
-            except:
-                api_links = []
+            api_links = submit_search(driver, "api_no", api_number)
                 
             if api_links:
                 target_link = api_links[0]
                 print(f"Found results for API number: {api_number}")
+            elif inconclusive or api_links is None:
+                raise TimeoutException(f"search for {well_name} / {api_number} showed no results or message")
             else:
                 print(f"No results for both Well Name ({well_name}) and API ({api_number}).")
+                if raw is not None:
+                    raw["not_found"] = True
                 return None
         
         
         # Click the link and enter well details page
         WebDriverWait(driver, 10).until(EC.element_to_be_clickable(target_link))
-        target_link.click()
-        
-        # wait for well details page loaded
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table tr"))
-        )
-    
-        
-        # Results table - status, type, closest city
-        rows = driver.find_elements(By.CSS_SELECTOR, "table tr")
-        data = {}
-        for row in rows:
-            ths = row.find_elements(By.TAG_NAME, "th")
-            tds = row.find_elements(By.TAG_NAME, "td")
-            for th, td in zip(ths, tds):
-                key = th.text.strip()
-                val = td.text.strip()
-                data[key] = val
-        
-        
-        # process lat and lon
-        lat, lon = None, None
-        if "Latitude / Longitude" in data:
-            coords = data["Latitude / Longitude"].split(",")
-            if len(coords) == 2:
-                try:
-                    lat = float(coords[0].strip())
-                except:
-                    lat = None
-                try:
-                    lon = float(coords[1].strip())
-                except:
-                    lon = None
-        
-        # Oil & Gas defaukt
-        oil_val, oil_desc = 0, "N/A"
-        gas_val, gas_desc = 0, "N/A"
-        
-        # blcok_state - oil_bbl, gas_bbl
-        stats = driver.find_elements(By.CSS_SELECTOR, "p.block_stat")
-        
-        for stat in stats:
-            text = stat.text.strip()
-            try:
-                span_val = stat.find_element(By.TAG_NAME, "span").text.strip()
-            except:
-                span_val = "0"
-                
-            num_str = span_val.replace(",", "").strip()
-                
-            if "Oil Produced" in text:
-                oil_val = int(num_str) if num_str.isdigit() else 0
-                oil_desc = text
-            elif "Gas Produced" in text:
-                gas_val = int(num_str) if num_str.isdigit() else 0
-                gas_desc = text
+        rate_limit(BASE_URL)
+        with timed("detail_load"):
+            target_link.click()
+            
+            # wait for well details page loaded
+            WebDriverWait(driver, LATENCY.timeout("detail_load", 15)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "table tr"))
+            )
         
-        # result
-        result = {
-            "status": data.get("Well Status", "N/A"),
-            "type": data.get("Well Type", "N/A"),
-            "city": data.get("Closest City", "N/A"),
-            "lat": lat,
-            "lon": lon,
-            "oil_bbl": oil_val,
-            "oil_desc": oil_desc,
-            "gas_bbl": gas_val,
-            "gas_desc": gas_desc
-        }
+        t_extract = time.perf_counter()
+        html = None
+        if extract == "html":
+            # one round trip for the whole page, parsed locally
+            html = driver.page_source
+            result = parse_detail_html(html)
+        elif extract == "script":
+            result = build_result(*_extract_with_script(driver))
+        else:
+            result = build_result(*_extract_with_elements(driver))
+        LATENCY.record("extract", time.perf_counter() - t_extract)
+        if raw is not None:
+            raw["html"], raw["url"] = html or driver.page_source, driver.current_url
         
         
         return result
-        
-    except Exception as e:
-        print(f"Error scraping well {api_number}: {e}")
-        return None
     
     finally:
-        driver.quit()
\ No newline at end of file
+        if own_driver:
+            driver.quit()
+
+# ---- HTTP fast path: same result dict, no browser ----
+HTTP_TIMEOUT = 15
+HTTP_RETRIES = 3
+RETRY_STATUS = {429, 500, 502, 503, 504}
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # one pooled Session per process: keep-alive connections are reused across wells and threads
+    global _session
+    with _session_lock:
+        if _session is None:
+            from requests.adapters import HTTPAdapter
+            s = requests.Session()
+            s.headers.update(HTTP_HEADERS)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def _request(session, method, url, **kw):
+    """Rate-limited request; retries connection errors, timeouts, 429 and 5xx with jittered backoff."""
+    for attempt in range(HTTP_RETRIES + 1):
+        rate_limit(url)
+        try:
+            with timed("http_request"):
+                r = session.request(method, url, timeout=HTTP_TIMEOUT, **kw)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == HTTP_RETRIES:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        if r.status_code in RETRY_STATUS and attempt < HTTP_RETRIES:
+            retry_after = r.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else backoff_delay(attempt))
+            continue
+        r.raise_for_status()
+        return r
+
+
+def _search_form(soup, field, base_url):
+    """(method, action url, default params) of the form holding input `field`."""
+    inp = soup.find(["input", "select"], attrs={"name": field})
+    form = inp.find_parent("form") if inp else None
+    if form is None:
+        return "get", base_url, {}
+    params = {}
+    for el in form.find_all(["input", "select"]):
+        name = el.get("name")
+        if not name or el.get("type") in ("submit", "button", "image", "reset"):
+            continue
+        if el.name == "select":
+            opt = el.find("option", selected=True) or el.find("option")
+            params[name] = opt.get("value", opt.get_text(strip=True)) if opt else ""
+        elif el.get("type") in ("checkbox", "radio"):
+            if el.has_attr("checked"):
+                params[name] = el.get("value", "on")
+        else:
+            params[name] = el.get("value", "")
+    return (form.get("method") or "get").lower(), requests.compat.urljoin(base_url, form.get("action") or base_url), params
+
+
+def _http_first_result(session, field, value, base_url):
+    """Submit the search form with `field`=value; URL of the first result link or None."""
+    r = _request(session, "GET", base_url)
+    method, action, params = _search_form(BeautifulSoup(r.text, "html.parser"), field, base_url)
+    params[field] = value
+    if method == "post":
+        r = _request(session, "POST", action, data=params)
+    else:
+        r = _request(session, "GET", action, params=params)
+    link = BeautifulSoup(r.text, "html.parser").select_one("table tr td a[href]")
+    return requests.compat.urljoin(r.url, link["href"]) if link else None
+
+
+def _text(el):
+    # BeautifulSoup equivalent of WebElement.text for these simple blocks
+    return re.sub(r"\s+", " ", el.get_text(" ", strip=True)).strip()
+
+
+def parse_detail_html(html):
+    """Parse a well detail page into the search_well result dict."""
+    soup = BeautifulSoup(html, "html.parser")
+    data = {}
+    for row in soup.select("table tr"):
+        for th, td in zip(row.find_all("th"), row.find_all("td")):
+            data[_text(th)] = _text(td)
+    stats = []
+    for stat in soup.select("p.block_stat"):
+        span = stat.find("span")
+        stats.append((_text(stat), _text(span) if span else "0"))
+    if not data and not stats:
+        raise ValueError("no well detail tables in page")
+    return build_result(data, stats)
+
+
+def search_well_http(api_number, well_name, session=None, base_url=BASE_URL, raw=None):
+    """search_well without a browser. None when neither name nor API finds a well;
+    raises on HTTP errors or an unexpected page so callers can fall back to Selenium."""
+    if not api_number and not well_name:
+        print("Missing both api_number and well_name, skip search.")
+        return None
+    session = session or get_session()
+
+    url = _http_first_result(session, "well_name", well_name, base_url) if well_name else None
+    if url:
+        print(f"Found results for Well Name: {well_name}")
+    elif api_number:
+        print(f"No result by Well Name -> retrying search with API number: {api_number}")
+        url = _http_first_result(session, "api_no", api_number, base_url)
+        if url:
+            print(f"Found results for API number: {api_number}")
+    if not url:
+        print(f"No results for both Well Name ({well_name}) and API ({api_number}).")
+        if raw is not None:
+            raw["not_found"] = True
+        return None
+
+    r = _request(session, "GET", url)
+    result = parse_detail_html(r.text)
+    if raw is not None:
+        raw["html"], raw["url"] = r.text, r.url
+    return result
+
+
+def scrape_well(api_number, well_name, pool=None, headless=True, engine="auto", raw=None):
+    """engine: "http", "selenium", or "auto" (HTTP first, Selenium only if HTTP errors out).
+    None means no such well; network/driver failures raise, so callers can retry them.
+    pool: DriverPool for the Selenium path; browsers start lazily, so HTTP-only runs never launch one."""
+    if engine == "http":
+        return search_well_http(api_number, well_name, raw=raw)
+    if engine == "auto":
+        try:
+            return search_well_http(api_number, well_name, raw=raw)
+        except Exception as e:
+            print(f"HTTP scrape failed for {well_name or api_number} ({e}); falling back to Selenium")
+    if pool is None:
+        return search_well(api_number, well_name, headless=headless, raw=raw)
+    with pool.driver() as driver:
+        return search_well(api_number, well_name, driver=driver, raw=raw)
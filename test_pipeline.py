@@ -1,50 +1,293 @@
-from db_utils import fetch_wells, update_well
-from scraper import search_well
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def test_pipeline(limit=None, headless=True):
+from db_utils import (fetch_wells, update_wells_by_id, ensure_indexes, well_key, ensure_checkpoint_tables, start_run,
+                      latest_run, add_run_wells, run_states, mark_run_well, finish_run)
+from scraper import scrape_well, DriverPool, backoff_delay, LATENCY
+from scrape_cache import ScrapeCache, cache_key
+from scraper import normalize_name
+from wells_preprocessing import canonicalize_api
+
+SCRAPE_ATTEMPTS = 3
+UPDATE_BATCH = 50           # scraped wells written per update_wells_by_id transaction
+UPDATE_FLUSH_SECS = 5.0     # ...or sooner, so checkpoints don't lag far behind the scraping
+# pipeline outcome -> checkpoint state
+RUN_STATE = {"updated": "done", "not_found": "not_found", "scrape_error": "failed", "db_error": "failed"}
+
+def test_pipeline(limit=None, headless=True, engine="auto", workers=4,
+                  use_cache=True, force_refresh=False, stale_while_revalidate=False,
+                  resume=False, retry_failed=False):
+    """resume: True for the latest unfinished run, or a run id; retry_failed also re-queues
+    the failed wells of that run (or of the latest run, finished or not)."""
     wells = fetch_wells()
     if limit:
         wells = wells[:limit]
 
+    ensure_checkpoint_tables()
+    run_id = None
+    if resume or retry_failed:
+        run_id = resume if type(resume) is int else latest_run(unfinished_only=not retry_failed)
+        if run_id is None:
+            print("No run to resume, starting a new one")
+    if run_id is None:
+        run_id = start_run()
+    add_run_wells(run_id, wells)
+    states = run_states(run_id)
+    todo_states = {"pending", "failed"} if retry_failed else {"pending"}
+    todo, seen = [], set()
     for w in wells:
-        api = w.get("api_number")
-        name = w.get("well_name_number")
+        k = well_key(w.get("api_number"), w.get("well_name_number"))
+        if k not in seen and states.get(k, ("pending", 0))[0] in todo_states:
+            seen.add(k)
+            todo.append(w)
+    print(f"Run {run_id}: {len(todo)} wells to scrape, {len(wells) - len(todo)} already finished or duplicate")
+    wells = todo
+
+    def checkpoint(w, o):
+        mark_run_well(run_id, well_key(w.get("api_number"), w.get("well_name_number")),
+                      RUN_STATE.get(o["outcome"], "failed"), o["attempts"], o["error"])
+
+    t0 = time.perf_counter()
+    cache = ScrapeCache() if use_cache else None
+    try:
+        outcomes = scrape_batch(wells, workers=workers, headless=headless, engine=engine,
+                                cache=cache, force=force_refresh, swr=stale_while_revalidate,
+                                on_result=checkpoint)
+    finally:
+        if cache:
+            cache.close()
+    elapsed = time.perf_counter() - t0
+    if not any(s == "pending" for s, _ in run_states(run_id).values()):
+        finish_run(run_id)
+
+    counts = {}
+    for o in outcomes:
+        counts[o["outcome"]] = counts.get(o["outcome"], 0) + 1
+        if o.get("cache"):
+            counts["cache " + o["cache"]] = counts.get("cache " + o["cache"], 0) + 1
+    print(f"\nDone: {len(outcomes)} wells in {elapsed:.1f}s "
+          f"({len(outcomes) / elapsed if elapsed else 0:.2f} wells/s, {workers} in flight)")
+    for k, n in sorted(counts.items()):
+        print(f"   {k}: {n}")
+    print("Scrape latency by stage:")
+    for stage, v in sorted(LATENCY.summary().items(), key=lambda kv: -kv[1]["total"]):
+        print(f"   {stage:<15} n={v['n']:<5} p50 {v['p50']*1000:7.0f} ms  p95 {v['p95']*1000:7.0f} ms  "
+              f"total {v['total']:7.1f}s")
+    return outcomes
+
+def group_wells(wells):
+    """Group rows that are the same well: same canonical API number, else same normalized name.
+    Returns lists of indexes into `wells`, in first-seen order."""
+    groups = {}
+    for i, w in enumerate(wells):
+        api = canonicalize_api(w.get("api_number"))
+        key = ("api", api) if api else ("name", normalize_name(w.get("well_name_number")) or f"#{i}")
+        groups.setdefault(key, []).append(i)
+    return list(groups.values())
+
+def scrape_batch(wells, workers=4, headless=True, engine="auto", cache=None, force=False, swr=False,
+                 on_result=None):
+    """run_pipeline over unique wells only; each result is fanned out to every duplicate row.
 
-        print(f"\nTesting {api} - {name}")
+    One outcome per input row, in input order. Every row of a group is written by id in the same
+    update_wells_by_id transaction as its representative, and is "updated" only if that UPDATE
+    matched it.
+    """
+    groups = group_wells(wells)
+    # representative: the first row that has a name, since the name search runs first
+    reps = [next((i for i in g if wells[i].get("well_name_number")), g[0]) for g in groups]
+    outcomes = [None] * len(wells)
 
+    def records(rep, clean):
+        return [(wells[i].get("id"), clean) for i in groups[rep_group[id(rep)]]]
+
+    def fan_out(rep, o):
+        for i in groups[rep_group[id(rep)]]:
+            w = wells[i]
+            if w is rep:
+                oi = o
+            else:
+                oi = dict(o, api_number=w.get("api_number"), well_name_number=w.get("well_name_number"),
+                          duplicate_of=rep.get("api_number") or rep.get("well_name_number"))
+                if o["outcome"] in ("updated", "db_error"):
+                    oi.update(row_outcome(w, o))
+            outcomes[i] = oi
+            if on_result:
+                on_result(w, oi)
+
+    rep_wells = [wells[i] for i in reps]
+    rep_group = {id(w): gi for gi, w in enumerate(rep_wells)}
+    print(f"{len(wells)} rows -> {len(rep_wells)} unique wells to scrape")
+    run_pipeline(rep_wells, workers=workers, headless=headless, engine=engine, cache=cache,
+                 force=force, swr=swr, on_result=fan_out, records=records)
+    return outcomes
+
+def run_pipeline(wells, workers=4, headless=True, engine="auto", cache=None, force=False, swr=False,
+                 on_result=None, records=None):
+    """Scrape up to `workers` wells at once and write them to the DB; returns one outcome dict per
+    well, in input order.
+
+    Requests to each host are throttled by scraper.rate_limit, so raising `workers` adds
+    throughput only until the per-host rate is reached.
+    With a cache, wells fetched within the TTL are served without any request; `force`
+    ignores it. With `swr`, expired entries are used right away and re-fetched in a second
+    pass once every other well is done.
+    Scraped wells are written by id from this thread with update_wells_by_id, UPDATE_BATCH at a
+    time (or after UPDATE_FLUSH_SECS); records(well, clean) lists the (id, clean) rows to write for
+    a well, by default just the well's own row. A well is "updated" only if the UPDATE matched its
+    row; out["touched"] holds the ids of its records that were matched.
+    on_result(well, outcome) is called from this thread once a well's outcome is final, i.e.
+    after its batch is committed.
+    """
+    if records is None:
+        records = lambda w, clean: [(w.get("id"), clean)]
+    outcomes = [None] * len(wells)
+    pending = []        # scraped, waiting for the next update_wells_by_id
+
+    def report(i):
+        if on_result:
+            on_result(wells[i], outcomes[i])
+
+    def flush():
+        if not pending:
+            return
+        batch = pending[:]
+        del pending[:]
+        recs = {i: records(wells[i], outcomes[i]["clean"]) for i in batch}
         try:
-            raw_data = search_well(api, name, headless=headless)
+            touched = update_wells_by_id([r for i in batch for r in recs[i]])
+            err = None
+            print(f"Updated {len(touched)} rows for {len(batch)} wells")
         except Exception as e:
-            print(f"Error during search_well for {name}: {e}")
-            continue
+            touched, err = set(), f"{type(e).__name__}: {e}"
+            print(f"Failed DB update for {len(batch)} wells: {e}")
+        for i in batch:
+            o = outcomes[i]
+            o["touched"] = {well_id for well_id, _ in recs[i] if well_id in touched}
+            o["db_error"] = err
+            o.update(row_outcome(wells[i], o))
+            report(i)
 
-        if not raw_data:
-            print(f"Failed scraping {name}")
-            continue
+    def collect(futs, cache_state=None):
+        oldest = time.monotonic()
+        try:
+            for f in as_completed(futs):
+                i = futs[f]
+                o = f.result()
+                if cache_state:
+                    o["cache"] = cache_state
+                outcomes[i] = o
+                if o["outcome"] is not None:        # not_found / scrape_error: nothing to write
+                    report(i)
+                    continue
+                if not pending:
+                    oldest = time.monotonic()
+                pending.append(i)
+                if len(pending) >= UPDATE_BATCH or time.monotonic() - oldest >= UPDATE_FLUSH_SECS:
+                    flush()
+        finally:
+            flush()     # an interrupted run still commits (and checkpoints) what it scraped
+
+    ensure_indexes()    # once, here: ALTER TABLE from several threads at once would race
+    # browsers start lazily, one per worker at most, and only if the Selenium fallback is needed
+    with DriverPool(size=workers, headless=headless) as pool, \
+         ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        collect({ex.submit(scrape_and_clean, w, pool, engine, cache, force, swr): i
+                 for i, w in enumerate(wells)})
+
+        stale = [i for i, o in enumerate(outcomes) if o.get("cache") == "stale"]
+        collect({ex.submit(scrape_and_clean, wells[i], pool, engine, cache, True): i for i in stale},
+                cache_state="revalidated")
+    return outcomes
+
+def row_outcome(w, o):
+    """outcome/error for row w after the flush that wrote o (matched ids in o["touched"])."""
+    if o["db_error"]:
+        return {"outcome": "db_error", "error": o["db_error"]}
+    if w.get("id") in o["touched"]:
+        return {"outcome": "updated", "error": None}
+    return {"outcome": "db_error", "error": f"wells row {w.get('id')} was not updated"}
+
+def scrape_and_clean(w, pool, engine="auto", cache=None, force=False, swr=False):
+    """Scrape one well. outcome stays None when there is data to write (out["clean"])."""
+    api = w.get("api_number")
+    name = w.get("well_name_number")
+    out = {"api_number": api, "well_name_number": name, "outcome": None, "attempts": 0, "error": None,
+           "cache": None}
+    t0 = time.perf_counter()
+
+    print(f"\nTesting {api} - {name}")
 
-        print(f"   Raw: {raw_data}")
-
-        # Clean data
-        clean = {
-            "status": raw_data.get("status") or "N/A",
-            "type": raw_data.get("type") or "N/A",
-            "city": raw_data.get("city") or "N/A",
-            "lat": raw_data.get("lat"),
-            "lon": raw_data.get("lon"),
-            "oil_bbl": raw_data.get("oil_bbl") or 0,
-            "oil_desc": raw_data.get("oil_desc") or "NA",
-            "gas_bbl": raw_data.get("gas_bbl") or 0,
-            "gas_desc": raw_data.get("gas_desc") or "NA",
-        }
-        print(f"   Clean: {clean}")
-
-        # Update DB
+    key = cache_key(api, name) if cache else None
+    hit = cache.lookup(key) if key and not force else None
+    if hit and (hit["fresh"] or swr):
+        out["cache"] = "hit" if hit["fresh"] else "stale"
+        raw_data = hit["result"]
+    else:
+        out["cache"] = ("refresh" if force else "miss") if key else None
+        raw_data = fetch_well(api, name, pool, engine, out, cache, key)
+
+    if not raw_data:
+        out["outcome"] = "scrape_error" if out["error"] else "not_found"
+        print(f"Failed scraping {name}")
+        out["secs"] = time.perf_counter() - t0
+        return out
+
+    print(f"   Raw: {raw_data}")
+
+    # Clean data
+    clean = {
+        "status": raw_data.get("status") or "N/A",
+        "type": raw_data.get("type") or "N/A",
+        "city": raw_data.get("city") or "N/A",
+        "lat": raw_data.get("lat"),
+        "lon": raw_data.get("lon"),
+        "oil_bbl": raw_data.get("oil_bbl") or 0,
+        "oil_desc": raw_data.get("oil_desc") or "NA",
+        "gas_bbl": raw_data.get("gas_bbl") or 0,
+        "gas_desc": raw_data.get("gas_desc") or "NA",
+    }
+    print(f"   Clean: {clean}")
+
+    out["clean"] = clean
+    out["secs"] = time.perf_counter() - t0
+    return out
+
+def fetch_well(api, name, pool, engine, out, cache=None, key=None):
+    """scrape_well with well-level retries; successful lookups (and clean misses) go to the cache."""
+    raw_data = None
+    for attempt in range(SCRAPE_ATTEMPTS):
+        out["attempts"] = attempt + 1
+        raw = {}
         try:
-            update_well(api, name, clean)
-            print(f"Updated well {api or name}")
+            raw_data = scrape_well(api, name, pool=pool, engine=engine, raw=raw)
+            out["error"] = None
         except Exception as e:
-            print(f"Failed DB update for {api or name}: {e}")
+            out["error"] = f"{type(e).__name__}: {e}"
+            print(f"Error during search_well for {name} (attempt {attempt + 1}): {e}")
+            if attempt + 1 < SCRAPE_ATTEMPTS:
+                time.sleep(backoff_delay(attempt))
+            continue
+        if cache and key and (raw_data or raw.get("not_found")):
+            cache.store(key, raw_data, raw.get("html"), raw.get("url"))
+        break
+    return raw_data
 
 if __name__ == "__main__":
-    # limit=5 → only test 5 wells to avoid too many website requests
-    test_pipeline(limit=None, headless=False)
\ No newline at end of file
+    ap = argparse.ArgumentParser()
+    # --limit 5 → only test 5 wells to avoid too many website requests
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--headless", action="store_true", help="Hide the browser on the Selenium fallback")
+    ap.add_argument("--engine", choices=["auto", "http", "selenium"], default="auto")
+    ap.add_argument("--workers", type=int, default=4, help="Wells scraped at once")
+    ap.add_argument("--no-cache", action="store_true", help="Don't read or write the scrape cache")
+    ap.add_argument("--force-refresh", action="store_true", help="Re-scrape even wells cached within the TTL")
+    ap.add_argument("--swr", action="store_true", help="Use expired cache entries now, re-scrape them at the end")
+    ap.add_argument("--resume", nargs="?", type=int, const=True, default=False, metavar="RUN_ID",
+                    help="Continue the unfinished wells of the latest unfinished run (or RUN_ID)")
+    ap.add_argument("--retry-failed", action="store_true", help="Also re-queue wells that failed in that run")
+    args = ap.parse_args()
+    test_pipeline(limit=args.limit, headless=args.headless, engine=args.engine, workers=args.workers,
+                  use_cache=not args.no_cache, force_refresh=args.force_refresh,
+                  stale_while_revalidate=args.swr, resume=args.resume, retry_failed=args.retry_failed)
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+
+import db_utils
+
+DATA = {"status": "Active", "type": "Oil", "city": "Williston", "lat": 48.1, "lon": -103.6,
+        "oil_bbl": 10, "oil_desc": "x", "gas_bbl": 0, "gas_desc": "y"}
+
+
+class FakeCursor:
+    def __init__(self, log, existing=()):
+        self.log = log
+        self.existing = existing
+        self.staged = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.log.append(("execute", sql, params))
+        if sql.startswith("UPDATE"):
+            self.rowcount = 2
+
+    def fetchall(self):
+        # the matched-keys SELECT: staged keys that exist in wells
+        return [(r[0],) for r in self.staged if r[0] in self.existing]
+
+    def executemany(self, sql, rows):
+        self.log.append(("executemany", sql, list(rows)))
+        self.staged.extend(rows)
+
+
+class FakeConn:
+    def __init__(self, log, existing):
+        self.log = log
+        self.existing = existing
+
+    def cursor(self):
+        return FakeCursor(self.log, self.existing)
+
+
+def fake_db(monkeypatch, existing=()):
+    log = []
+
+    @contextmanager
+    def connection(commit=False, **extra):
+        yield FakeConn(log, existing)
+
+    monkeypatch.setattr(db_utils, "connection", connection)
+    monkeypatch.setattr(db_utils, "_indexes_checked", True)
+    return log
+
+
+def test_update_wells_skips_records_without_a_name(monkeypatch):
+    log = fake_db(monkeypatch)
+    changed = db_utils.update_wells([
+        ("33-105-00001", "Atlanta 1", DATA),
+        ("33-105-00002", None, DATA),
+        ("33-105-00003", "", DATA),
+        ("33-105-00004", "Atlanta 4", DATA),
+    ])
+    assert changed == 2
+    (inserted,) = [rows for kind, _, rows in log if kind == "executemany"]
+    assert [r[0] for r in inserted] == ["Atlanta 1", "Atlanta 4"]
+
+
+def test_update_wells_with_only_nameless_records_does_nothing(monkeypatch):
+    log = fake_db(monkeypatch)
+    assert db_utils.update_wells([("33-105-00002", None, DATA)]) == 0
+    assert log == []
+
+
+def test_update_wells_by_id_reports_only_matched_rows(monkeypatch):
+    log = fake_db(monkeypatch, existing={1, 3})
+    touched = db_utils.update_wells_by_id([(1, DATA), (None, DATA), (3, DATA), (7, DATA)])
+    assert touched == {1, 3}
+    (inserted,) = [rows for kind, _, rows in log if kind == "executemany"]
+    assert [r[0] for r in inserted] == [1, 3, 7]
+    assert any("ON w.id = t.id" in sql for kind, sql, _ in log if kind == "execute")
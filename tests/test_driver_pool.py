@@ -0,0 +1,46 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+
+import scraper
+
+
+class FakeDriver:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return "about:blank"
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def pool_with(monkeypatch, d):
+    monkeypatch.setattr(scraper, "make_driver", lambda headless: d)
+    return scraper.DriverPool(size=1)
+
+
+@pytest.mark.parametrize("exc, alive, kept", [
+    (TimeoutException("slow page"), True, True),
+    (WebDriverException("element not interactable"), True, True),
+    (WebDriverException("chrome not reachable"), False, False),
+    (InvalidSessionIdException("session deleted"), True, False),
+])
+def test_only_dead_drivers_are_discarded(monkeypatch, exc, alive, kept):
+    d = FakeDriver(alive)
+    pool = pool_with(monkeypatch, d)
+    with pytest.raises(type(exc)):
+        with pool.driver():
+            raise exc
+    assert d.quit_called is not kept
+    assert pool._idle.qsize() == (1 if kept else 0)
@@ -0,0 +1,107 @@
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+import scraper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+WELL_NAME, API = "Atlanta 14-6H", "33-053-06057"
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """Serves the saved DrillingEdge pages: the form, results or an empty search, and the detail page."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = parse_qs(url.query)
+        if url.path == "/search" and not q:
+            page = "search_form.html"
+        elif url.path == "/search":
+            # the form's hidden and selected defaults must come along with the search field
+            if q.get("type") != ["wells"] or q.get("state") != ["ND"] or "show_inactive" in q:
+                self.send_error(400)
+                return
+            hit = q.get("well_name") == [WELL_NAME] or q.get("api_no") == [API]
+            page = "search_results.html" if hit else "search_empty.html"
+        elif url.path.endswith("/wells/atlanta-14-6h/" + API):
+            page = "well_detail.html"
+        else:
+            self.send_error(404)
+            return
+        body = (FIXTURES / page).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(monkeypatch):
+    monkeypatch.setattr(scraper, "rate_limit", lambda url: None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/search"
+    server.shutdown()
+    server.server_close()
+
+
+class SoupElement:
+    """Just enough of a WebElement, over a BeautifulSoup tag, for _extract_with_elements."""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @property
+    def text(self):
+        return scraper._text(self.tag)
+
+    def find_elements(self, by, value):
+        if by == scraper.By.TAG_NAME:
+            return [SoupElement(t) for t in self.tag.find_all(value)]
+        return [SoupElement(t) for t in self.tag.select(value)]
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise scraper.WebDriverException(f"no such element: {value}")
+        return found[0]
+
+
+def selenium_result(html):
+    return scraper.build_result(*scraper._extract_with_elements(SoupElement(BeautifulSoup(html, "html.parser"))))
+
+
+def test_http_path_matches_selenium_path(site):
+    raw = {}
+    with requests.Session() as session:
+        result = scraper.search_well_http(API, WELL_NAME, session=session, base_url=site, raw=raw)
+    assert result == selenium_result((FIXTURES / "well_detail.html").read_text())
+    assert result == {
+        "status": "Active", "type": "Oil & Gas", "city": "Williston", "lat": 48.0587, "lon": -103.6128,
+        "oil_bbl": 1234567, "oil_desc": "1,234,567 Barrels of Oil Produced in Jan 2024",
+        "gas_bbl": 89000, "gas_desc": "89,000 MCF of Gas Produced in Jan 2024",
+    }
+    assert raw["url"].endswith("/wells/atlanta-14-6h/" + API)
+
+
+def test_http_path_falls_back_to_api_number(site):
+    with requests.Session() as session:
+        result = scraper.search_well_http(API, "Atlanta 14-6H (renamed)", session=session, base_url=site)
+    assert result["status"] == "Active"
+
+
+def test_http_path_not_found(site):
+    raw = {}
+    with requests.Session() as session:
+        assert scraper.search_well_http("33-000-00000", "Nowhere 1", session=session, base_url=site, raw=raw) is None
+    assert raw["not_found"]
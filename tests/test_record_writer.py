@@ -0,0 +1,62 @@
+import wells_preprocessing as wp
+
+
+class FakeCursor:
+    def __init__(self, max_id, auto_increment):
+        self.results = {"MAX(id)": (max_id,), "AUTO_INCREMENT": (auto_increment,)}
+        self.last = None
+        self.written = []
+
+    def execute(self, sql, params=None):
+        self.last = next((v for k, v in self.results.items() if k in sql), None)
+
+    def fetchone(self):
+        return self.last
+
+    def executemany(self, sql, rows):
+        if sql == wp.UPSERT_SQL:
+            self.written.extend(rows)
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self, cur):
+        self.cur = cur
+
+    def cursor(self):
+        return self.cur
+
+    def start_transaction(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def entry(n):
+    return {"path": f"/pdfs/W{n}.pdf", "size_bytes": 1, "mtime": 0.0, "content_sha256": "x",
+            "parser_version": wp.PARSER_VERSION, "row_id": None}
+
+
+def write_new(max_id, auto_increment):
+    cur = FakeCursor(max_id, auto_increment)
+    writer = wp.RecordWriter(FakeConn(cur), mode="batch")
+    entries = [entry(1), entry(2)]
+    for e in entries:
+        writer.add(e, {})
+    writer.close()
+    return [e["row_id"] for e in entries], [r[0] for r in cur.written]
+
+
+def test_new_rows_do_not_reuse_ids_of_deleted_tail_rows():
+    # rows 11..14 were deleted: MAX(id) is 10 but AUTO_INCREMENT has moved on to 15
+    assert write_new(10, 15) == ([15, 16], [15, 16])
+
+
+def test_new_rows_follow_max_id_when_it_is_ahead():
+    assert write_new(20, 15) == ([21, 22], [21, 22])
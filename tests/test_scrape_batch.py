@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+
+import test_pipeline
+
+CLEAN = {"status": "Active"}
+
+
+@contextmanager
+def no_pool(**kwargs):
+    yield None
+
+
+def run_batch(monkeypatch, wells, existing):
+    written = []
+
+    def scrape_and_clean(w, pool, engine="auto", cache=None, force=False, swr=False):
+        return {"api_number": w["api_number"], "well_name_number": w["well_name_number"],
+                "outcome": None, "attempts": 1, "error": None, "clean": CLEAN}
+
+    def update_wells_by_id(records):
+        written.extend(well_id for well_id, _ in records)
+        return {well_id for well_id, _ in records if well_id in existing}
+
+    monkeypatch.setattr(test_pipeline, "scrape_and_clean", scrape_and_clean)
+    monkeypatch.setattr(test_pipeline, "update_wells_by_id", update_wells_by_id)
+    monkeypatch.setattr(test_pipeline, "ensure_indexes", lambda: None)
+    monkeypatch.setattr(test_pipeline, "DriverPool", no_pool)
+    return test_pipeline.scrape_batch(wells, workers=1), written
+
+
+def test_duplicates_are_written_by_id(monkeypatch):
+    wells = [
+        {"id": 1, "api_number": "33-105-00001", "well_name_number": "Atlanta 1"},
+        {"id": 2, "api_number": "3310500001", "well_name_number": None},
+        {"id": 3, "api_number": "33-105-00001-00-00", "well_name_number": "ATLANTA #1"},
+    ]
+    outcomes, written = run_batch(monkeypatch, wells, existing={1, 2, 3})
+    assert sorted(written) == [1, 2, 3]
+    assert [o["outcome"] for o in outcomes] == ["updated"] * 3
+
+
+def test_unmatched_duplicate_is_not_reported_updated(monkeypatch):
+    wells = [
+        {"id": 1, "api_number": "33-105-00001", "well_name_number": "Atlanta 1"},
+        {"id": 2, "api_number": "3310500001", "well_name_number": None},
+    ]
+    outcomes, _ = run_batch(monkeypatch, wells, existing={1})
+    assert outcomes[0]["outcome"] == "updated"
+    assert outcomes[1]["outcome"] == "db_error"
+    assert "wells row 2" in outcomes[1]["error"]
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+import scraper
+
+
+class LoadedPage:
+    """A fully loaded results page with no result links and the given body text."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def find_elements(self, *by):
+        return []
+
+    def execute_script(self, script):
+        return "complete"
+
+    def find_element(self, *by):
+        return SimpleNamespace(text=self.text)
+
+
+def test_no_results_message_means_empty():
+    cond = scraper.results_or_empty(None)
+    assert cond(LoadedPage("Sorry, no results found.")) is scraper.NO_RESULTS
+
+
+def test_silent_page_keeps_waiting():
+    cond = scraper.results_or_empty(None)
+    assert cond(LoadedPage("Search results")) is False
+    assert cond.loaded
+
+
+def test_inconclusive_search_is_not_a_miss(monkeypatch):
+    monkeypatch.setattr(scraper, "submit_search", lambda driver, field, value: None)
+    raw = {}
+    with pytest.raises(TimeoutException):
+        scraper.search_well("33-105-00001", "Atlanta 1", driver=object(), raw=raw)
+    assert "not_found" not in raw
+
+
+def test_confirmed_miss_is_not_found(monkeypatch):
+    monkeypatch.setattr(scraper, "submit_search", lambda driver, field, value: [])
+    raw = {}
+    assert scraper.search_well("33-105-00001", "Atlanta 1", driver=object(), raw=raw) is None
+    assert raw["not_found"]
@@ -0,0 +1,24 @@
+import wells_columns
+
+
+def test_ids_round_trip_as_uint64(tmp_path):
+    path = tmp_path / "wells_columns.bin"
+    rows = [
+        {"id": 1, "lat": "48.1", "lon": "-103.6"},
+        {"id": 2**40, "latitude": 47.5, "longitude": -102.25},
+    ]
+    assert wells_columns.write_columns(path, rows) == 2
+    cols = wells_columns.open_columns(path)
+    assert list(cols["id"]) == [1, 2**40]
+    assert list(cols["lat"]) == [48.1, 47.5]
+    assert path.stat().st_size == wells_columns.HEADER.size + 24 * 2
+
+
+def test_coord_takes_the_first_non_empty_value_like_the_webapp(tmp_path):
+    rows = [
+        {"id": 1, "lat": "n/a", "latitude": "48.1", "lon": "-103.6"},    # unmappable in the webapp too
+        {"id": 2, "lat": "", "latitude": "48.2", "lon": None, "longitude": "-103.7"},
+    ]
+    path = tmp_path / "wells_columns.bin"
+    assert wells_columns.write_columns(path, rows) == 1
+    assert list(wells_columns.open_columns(path)["id"]) == [2]
@@ -1,84 +1,576 @@
 #!/usr/bin/env python3
-from flask import Flask, jsonify, send_from_directory, abort
+from flask import Flask, jsonify, send_from_directory, abort, request, Response
 from dotenv import load_dotenv
 import os
-import mysql.connector
+import sys
 import csv
+import gzip
+import hashlib
+import json
+import math
+import shutil
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 import logging
+try:
+    import brotli     # optional: br responses when installed
+except ImportError:
+    brotli = None
 
 load_dotenv()
 
+# db_pool.py lives in the repo root, next to wells.csv
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from db_pool import get_connection
+from wells_columns import pack_columns
+
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 
 def get_conn():
-    return mysql.connector.connect(
-        host=os.getenv('MYSQL_HOST', 'localhost'),
-        port=int(os.getenv('MYSQL_PORT', '3306')),
-        user=os.getenv('MYSQL_USER'),
-        password=os.getenv('MYSQL_PASSWORD'),
-        database=os.getenv('MYSQL_DB', 'wells_db')
-    )
+    # pooled connection shared with db_utils / wells_preprocessing; close() returns it to the pool
+    return get_connection()
 
-@app.route('/api/wells')
-def api_wells():
+def _feature(r, lat_keys, lon_keys, zero_is_missing=False):
+    # try multiple column name variants
+    latv = next((r.get(k) for k in lat_keys if r.get(k) not in (None, '')), None)
+    lonv = next((r.get(k) for k in lon_keys if r.get(k) not in (None, '')), None)
+    missing = (None, '', '0.0') if zero_is_missing else (None, '')
+    try:
+        lat = float(latv) if latv not in missing else None
+        lon = float(lonv) if lonv not in missing else None
+    except Exception:
+        lat = lon = None
+    if lat is None or lon is None:
+        return None
+    props = {k: (v if v is not None else '') for k, v in r.items()}
+    return {
+        'type': 'Feature',
+        'geometry': { 'type': 'Point', 'coordinates': [lon, lat] },
+        'properties': props
+    }
+
+# List responses carry only these; the full row is fetched per well from /api/wells/<id>
+SUMMARY_FIELDS = ('id', 'well_name_number', 'api_number', 'status')
+
+def summary_props(props):
+    return {k: props.get(k, '') for k in SUMMARY_FIELDS if k in props}
+
+def int_id(props):
+    fid = props.get('id')
+    return fid if isinstance(fid, int) and fid >= 0 else None
+
+def slim_feature(f):
+    return {'type': 'Feature', 'geometry': f['geometry'], 'properties': summary_props(f['properties'])}
+
+CSV_PATH = Path(__file__).resolve().parents[1] / 'wells.csv'
+
+def load_features():
+    """All mappable wells as GeoJSON features: from the DB, else from wells.csv."""
     features = []
 
     # 1) Try DB
     try:
         conn = get_conn()
-        cur = conn.cursor(dictionary=True)
-        cur.execute("SELECT * FROM wells")
-        rows = cur.fetchall()
-        cur.close(); conn.close()
+        try:
+            cur = conn.cursor(dictionary=True)
+            cur.execute("SELECT * FROM wells")
+            rows = cur.fetchall()
+            cur.close()
+        finally:
+            conn.close()
 
         for r in rows:
-            # try multiple column name variants
-            latv = r.get('lat') or r.get('latitude')
-            lonv = r.get('lon') or r.get('longitude')
-            try:
-                lat = float(latv) if latv not in (None, '') else None
-                lon = float(lonv) if lonv not in (None, '') else None
-            except Exception:
-                lat = lon = None
-            if lat is None or lon is None:
-                continue
-            props = {k: (v if v is not None else '') for k, v in r.items()}
-            features.append({
-                'type': 'Feature',
-                'geometry': { 'type': 'Point', 'coordinates': [lon, lat] },
-                'properties': props
-            })
+            f = _feature(r, ('lat', 'latitude'), ('lon', 'longitude'))
+            if f:
+                features.append(f)
     except Exception as e:
         logging.warning('DB read failed: %s', e)
 
     # 2) Fallback: read wells.csv in repo root if features empty
-    if not features:
-        csv_path = Path(__file__).resolve().parents[1] / 'wells.csv'
-        if csv_path.exists():
+    if not features and CSV_PATH.exists():
+        try:
+            with CSV_PATH.open(newline='', encoding='utf-8') as fh:
+                for n, r in enumerate(csv.DictReader(fh), 1):
+                    # no id column in the CSV: the row number stands in for it
+                    f = _feature({'id': n, **r}, ('latitude',), ('longitude',), zero_is_missing=True)
+                    if f:
+                        features.append(f)
+        except Exception as e:
+            logging.warning('CSV fallback read failed: %s', e)
+    return features
+
+def data_marker():
+    """Cheap fingerprint of the wells data; the snapshot is rebuilt when it changes."""
+    try:
+        conn = get_conn()
+        try:
+            cur = conn.cursor()
             try:
-                with csv_path.open(newline='', encoding='utf-8') as fh:
-                    rdr = csv.DictReader(fh)
-                    for r in rdr:
-                        latv = r.get('latitude')
-                        lonv = r.get('longitude')
-                        try:
-                            lat = float(latv) if latv not in (None, '', '0.0') else None
-                            lon = float(lonv) if lonv not in (None, '', '0.0') else None
-                        except Exception:
-                            lat = lon = None
-                        if lat is None or lon is None:
-                            continue
-                        props = {k: (v if v is not None else '') for k, v in r.items()}
-                        features.append({
-                            'type': 'Feature',
-                            'geometry': { 'type': 'Point', 'coordinates': [lon, lat] },
-                            'properties': props
-                        })
-            except Exception as e:
-                logging.warning('CSV fallback read failed: %s', e)
-
-    return jsonify({ 'type': 'FeatureCollection', 'features': features })
+                cur.execute("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM wells")
+            except Exception:
+                # older schema without updated_at: in-place UPDATEs go unnoticed until SNAPSHOT_MAX_AGE
+                cur.execute("SELECT COUNT(*), MAX(id) FROM wells")
+            marker = ('db',) + tuple(str(v) for v in cur.fetchone())
+            cur.close()
+        finally:
+            conn.close()
+        return marker
+    except Exception:
+        pass
+    try:
+        st = CSV_PATH.stat()
+        return ('csv', st.st_size, st.st_mtime)
+    except OSError:
+        return ('none',)
+
+# How often (seconds) a request may re-check data_marker(); in between the snapshot is trusted
+SNAPSHOT_CHECK_SECS = float(os.getenv('SNAPSHOT_CHECK_SECS', '5'))
+# Rebuild at least this often even if the marker looks unchanged
+SNAPSHOT_MAX_AGE = float(os.getenv('SNAPSHOT_MAX_AGE', '600'))
+
+class Snapshot:
+    """Features loaded once, plus artifacts derived from them (encoded bodies, indexes, ...).
+
+    derive(name, fn) builds an artifact on first use and keeps it until the data changes, so
+    every endpoint serving the same data shares one invalidation rule.
+    """
+
+    def __init__(self, marker, features):
+        self.marker = marker
+        self.built = time.monotonic()
+        self.features = features
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derive(self, name, fn):
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = fn(self)
+            return self._derived[name]
+
+_snapshot = None
+_snapshot_checked = 0.0
+_snapshot_lock = threading.Lock()
+
+def get_snapshot():
+    global _snapshot, _snapshot_checked
+    with _snapshot_lock:
+        now = time.monotonic()
+        if _snapshot is not None and now - _snapshot_checked < SNAPSHOT_CHECK_SECS:
+            return _snapshot
+        marker = data_marker()
+        _snapshot_checked = now
+        if _snapshot is None or marker != _snapshot.marker or now - _snapshot.built > SNAPSHOT_MAX_AGE:
+            _snapshot = Snapshot(marker, load_features())
+        return _snapshot
+
+def encoded_body(payload, shared=False):
+    """JSON bytes and their ETag; see compressed_body."""
+    return compressed_body(json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8'), shared)
+
+def compressed_body(raw, shared=False):
+    """A response body plus its ETag. gzip/br variants are made on demand, only for the encoding a
+    client accepts, and kept on the body. shared: kept for the snapshot's lifetime (or in the tile
+    cache), so worth a slower, smaller brotli; one-off bodies use a fast setting."""
+    return {'identity': raw, 'etag': hashlib.sha1(raw).hexdigest(), 'shared': shared}
+
+def _encoded(body, enc):
+    data = body.get(enc)
+    if data is None:
+        raw = body['identity']
+        if enc == 'br':
+            data = brotli.compress(raw, quality=9 if body['shared'] else 4)
+        else:
+            data = gzip.compress(raw, 6)
+        body[enc] = data        # a racing thread may compress it too; same bytes either way
+    return data
+
+def send_encoded(body, mimetype='application/json'):
+    """Serve a body from compressed_body: 304 on a matching If-None-Match, else the best encoding accepted."""
+    if body['etag'] in request.if_none_match:
+        resp = Response(status=304)
+    else:
+        accepted = request.accept_encodings
+        offered = ('br', 'gzip') if brotli is not None else ('gzip',)
+        enc = next((e for e in offered if accepted[e]), 'identity')
+        resp = Response(_encoded(body, enc), mimetype=mimetype)
+        if enc != 'identity':
+            resp.headers['Content-Encoding'] = enc
+    resp.set_etag(body['etag'])
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.headers['Cache-Control'] = 'no-cache'     # revalidate every time; unchanged data is a 304
+    return resp
+
+# Grid index over the snapshot: cell (ix, iy) of GRID_DEG degrees -> feature indexes
+GRID_DEG = float(os.getenv('GRID_DEG', '0.25'))
+DEFAULT_LIMIT = int(os.getenv('WELLS_DEFAULT_LIMIT', '5000'))
+MAX_LIMIT = 50000
+
+class GridIndex:
+    def __init__(self, features, cell=GRID_DEG):
+        self.cell = cell
+        self.cells = {}
+        self.lon = [f['geometry']['coordinates'][0] for f in features]
+        self.lat = [f['geometry']['coordinates'][1] for f in features]
+        for i, (x, y) in enumerate(zip(self.lon, self.lat)):
+            self.cells.setdefault((int(x // cell), int(y // cell)), []).append(i)
+        self.extent = [min(self.lon), min(self.lat), max(self.lon), max(self.lat)] if features else None
+
+    def query(self, w, s, e, n):
+        """Feature indexes inside the bbox, in table order."""
+        c = self.cell
+        x0, x1, y0, y1 = int(w // c), int(e // c), int(s // c), int(n // c)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            # bbox covers more cells than are occupied: walk the occupied ones instead
+            keys = [k for k in self.cells if x0 <= k[0] <= x1 and y0 <= k[1] <= y1]
+        else:
+            keys = [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1) if (x, y) in self.cells]
+        lon, lat = self.lon, self.lat
+        out = [i for k in keys for i in self.cells[k] if w <= lon[i] <= e and s <= lat[i] <= n]
+        out.sort()
+        return out
+
+def parse_bbox(value):
+    """'west,south,east,north' -> floats, clamped to lon/lat range; None if absent."""
+    if not value:
+        return None
+    try:
+        w, s, e, n = (float(v) for v in value.split(','))
+    except ValueError:
+        abort(400, 'bbox must be west,south,east,north')
+    return max(w, -180.0), max(s, -90.0), min(e, 180.0), min(n, 90.0)
+
+def zoom_limit(zoom, limit):
+    # zoomed-out views get fewer points; the client asks again as the user zooms in
+    if limit is None:
+        limit = DEFAULT_LIMIT if zoom is None or zoom >= 10 else max(500, DEFAULT_LIMIT >> (10 - zoom))
+    return max(1, min(limit, MAX_LIMIT))
+
+def thin(idxs, limit):
+    # evenly spaced sample so a truncated view still covers the whole bbox
+    if len(idxs) <= limit:
+        return idxs
+    step = len(idxs) / float(limit)
+    return [idxs[int(k * step)] for k in range(limit)]
+
+def viewport_query(snap):
+    """(matching indexes, indexes to send) for the request's bbox/zoom/limit; None without bbox or limit."""
+    bbox = parse_bbox(request.args.get('bbox'))
+    zoom = request.args.get('zoom', type=int)
+    limit = request.args.get('limit', type=int)
+    if bbox is None and limit is None:
+        return None
+    grid = snap.derive('grid', lambda s: GridIndex(s.features))
+    idxs = grid.query(*bbox) if bbox else list(range(len(snap.features)))
+    return idxs, thin(idxs, zoom_limit(zoom, limit))
+
+@app.route('/api/wells')
+def api_wells():
+    snap = get_snapshot()
+    slim = snap.derive('slim', lambda s: [slim_feature(f) for f in s.features])
+    view = viewport_query(snap)
+    if view is None:
+        body = snap.derive('geojson', lambda s: encoded_body({'type': 'FeatureCollection', 'features': slim}, shared=True))
+        return send_encoded(body)
+
+    idxs, shown = view
+    grid = snap.derive('grid', lambda s: GridIndex(s.features))
+    return send_encoded(encoded_body({
+        'type': 'FeatureCollection',
+        'features': [slim[i] for i in shown],
+        'matched': len(idxs),
+        'total': len(snap.features),
+        'truncated': len(shown) < len(idxs),
+        'extent': grid.extent,
+    }))
+
+@app.route('/api/wells.bin')
+def api_wells_bin():
+    """Same wells and parameters as /api/wells, packed as lon/lat/id columns (format in wells_columns.py)."""
+    snap = get_snapshot()
+    grid = snap.derive('grid', lambda s: GridIndex(s.features))
+    ids = snap.derive('ids', lambda s: [int_id(f['properties']) or 0 for f in s.features])
+    view = viewport_query(snap)
+    if view is None:
+        body = snap.derive('columns', lambda s: compressed_body(pack_columns(ids, grid.lon, grid.lat), shared=True))
+        return send_encoded(body, 'application/octet-stream')
+
+    idxs, shown = view
+    raw = pack_columns([ids[i] for i in shown], [grid.lon[i] for i in shown], [grid.lat[i] for i in shown],
+                       matched=len(idxs), total=len(snap.features))
+    return send_encoded(compressed_body(raw), 'application/octet-stream')
+
+@app.route('/api/wells/<int:well_id>')
+def api_well(well_id):
+    snap = get_snapshot()
+    by_id = snap.derive('by_id', lambda s: {str(f['properties'].get('id')): f for f in s.features})
+    f = by_id.get(str(well_id))
+    if f is None:
+        abort(404)
+    return send_encoded(encoded_body(f))
+
+# Clusters: per zoom, wells binned into CLUSTER_CELL_PX-pixel cells of the Web Mercator tile grid.
+# Cells double in size per zoom level out, so each level is built by merging the one below.
+CLUSTER_MAX_ZOOM = int(os.getenv('CLUSTER_MAX_ZOOM', '11'))
+CLUSTER_CELL_PX = 64
+
+def mercator(lon, lat):
+    """lon/lat -> Web Mercator x, y in [0, 1)."""
+    lat = max(min(lat, 85.05112878), -85.05112878)
+    s = math.sin(math.radians(lat))
+    return (lon + 180.0) / 360.0, 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+
+class ClusterIndex:
+    def __init__(self, features, max_zoom=CLUSTER_MAX_ZOOM):
+        self.max_zoom = max_zoom
+        self.levels = [None] * (max_zoom + 1)
+        cells = {}
+        n = (256 // CLUSTER_CELL_PX) << max_zoom      # cells per axis at max_zoom
+        for i, f in enumerate(features):
+            lon, lat = f['geometry']['coordinates']
+            x, y = mercator(lon, lat)
+            key = (min(int(x * n), n - 1), min(int(y * n), n - 1))
+            c = cells.get(key)
+            if c is None:
+                cells[key] = [1, lon, lat, i]
+            else:
+                c[0] += 1; c[1] += lon; c[2] += lat
+        self.levels[max_zoom] = cells
+        for z in range(max_zoom - 1, -1, -1):
+            parent = {}
+            for (cx, cy), (cnt, slon, slat, i) in self.levels[z + 1].items():
+                p = parent.get((cx >> 1, cy >> 1))
+                if p is None:
+                    parent[(cx >> 1, cy >> 1)] = [cnt, slon, slat, i]
+                else:
+                    p[0] += cnt; p[1] += slon; p[2] += slat
+            self.levels[z] = parent
+
+    def query(self, z, bbox=None):
+        """[(count, lon, lat, first feature index)] at zoom z, centroids inside bbox."""
+        z = max(0, min(z, self.max_zoom))
+        out = []
+        for cnt, slon, slat, i in self.levels[z].values():
+            lon, lat = slon / cnt, slat / cnt
+            if bbox and not (bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]):
+                continue
+            out.append((cnt, lon, lat, i))
+        return out
+
+@app.route('/api/wells/clusters')
+def api_well_clusters():
+    snap = get_snapshot()
+    z = request.args.get('z', type=int)
+    if z is None:
+        abort(400, 'z is required')
+    bbox = parse_bbox(request.args.get('bbox'))
+    index = snap.derive('clusters', lambda s: ClusterIndex(s.features))
+    features = []
+    for cnt, lon, lat, i in index.query(z, bbox):
+        if cnt == 1:
+            f = snap.features[i]
+            features.append({'type': 'Feature', 'geometry': f['geometry'],
+                             'properties': dict(summary_props(f['properties']), count=1)})
+        else:
+            features.append({'type': 'Feature',
+                             'geometry': {'type': 'Point', 'coordinates': [round(lon, 6), round(lat, 6)]},
+                             'properties': {'cluster': True, 'count': cnt}})
+    extent = snap.derive('grid', lambda s: GridIndex(s.features)).extent
+    return send_encoded(encoded_body({'type': 'FeatureCollection', 'features': features,
+                                      'zoom': z, 'max_zoom': index.max_zoom, 'extent': extent}))
+
+# Vector tiles: /tiles/wells/{z}/{x}/{y}.mvt with one "wells" layer of points. Up to CLUSTER_MAX_ZOOM
+# a tile holds the cluster cells inside it (count > 1 is a cluster), closer in the individual wells.
+TILE_EXTENT = 4096
+TILE_BUFFER = 64          # tile units kept beyond each edge, so markers on a tile border aren't cut off
+TILE_MAX_ZOOM = 22
+TILE_CACHE_SIZE = int(os.getenv('TILE_CACHE_SIZE', '1024'))
+# encoded tiles also go to disk, one directory per data version; TILE_CACHE_DIR= turns that off
+TILE_CACHE_DIR = os.getenv('TILE_CACHE_DIR', str(Path(__file__).resolve().parent / '.tile_cache'))
+MVT_MIMETYPE = 'application/vnd.mapbox-vector-tile'
+
+# Minimal protobuf writer for the parts of the MVT spec (v2) a point layer needs
+def _varint(n):
+    out = bytearray()
+    while n > 0x7f:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 31)
+
+def _uint_field(num, n):
+    return _varint(num << 3) + _varint(n)
+
+def _bytes_field(num, data):
+    return _varint(num << 3 | 2) + _varint(len(data)) + data
+
+def _packed(nums):
+    return b''.join(_varint(n) for n in nums)
+
+def encode_mvt(name, points, extent=TILE_EXTENT):
+    """points: [(x, y, props, id)] with x/y in tile units. Returns the tile bytes."""
+    keys, values, feats = {}, {}, []
+    for x, y, props, fid in points:
+        tags = []
+        for k, v in props.items():
+            if v is None or v == '':
+                continue
+            tags.append(keys.setdefault(k, len(keys)))
+            tags.append(values.setdefault(('u', v) if isinstance(v, int) and v >= 0 else ('s', str(v)), len(values)))
+        feat = _uint_field(1, fid) if fid is not None else b''
+        if tags:
+            feat += _bytes_field(2, _packed(tags))
+        feat += _uint_field(3, 1)                                            # POINT
+        feat += _bytes_field(4, _packed([9, _zigzag(x), _zigzag(y)]))        # MoveTo(1), dx, dy
+        feats.append(_bytes_field(2, feat))
+    if not feats:
+        return b''
+    layer = _uint_field(15, 2) + _bytes_field(1, name.encode('utf-8')) + b''.join(feats)
+    layer += b''.join(_bytes_field(3, k.encode('utf-8')) for k in keys)
+    layer += b''.join(_bytes_field(4, _uint_field(5, v) if t == 'u' else _bytes_field(1, v.encode('utf-8')))
+                      for (t, v) in values)
+    layer += _uint_field(5, extent)
+    return _bytes_field(3, layer)
+
+def unmercator(mx, my):
+    return mx * 360.0 - 180.0, math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * my))))
+
+def tile_points(snap, z, x, y):
+    n = 1 << z
+    pad = TILE_BUFFER / TILE_EXTENT
+    def to_tile(lon, lat):
+        mx, my = mercator(lon, lat)
+        tx, ty = round((mx * n - x) * TILE_EXTENT), round((my * n - y) * TILE_EXTENT)
+        if -TILE_BUFFER <= tx <= TILE_EXTENT + TILE_BUFFER and -TILE_BUFFER <= ty <= TILE_EXTENT + TILE_BUFFER:
+            return tx, ty
+        return None
+
+    points = []
+    if z <= CLUSTER_MAX_ZOOM:
+        level = snap.derive('clusters', lambda s: ClusterIndex(s.features)).levels[z]
+        per = 256 // CLUSTER_CELL_PX
+        # the ring of neighbouring cells too: their centroids may fall inside the buffer
+        for cx in range(x * per - 1, (x + 1) * per + 1):
+            for cy in range(y * per - 1, (y + 1) * per + 1):
+                c = level.get((cx, cy))
+                if c is None:
+                    continue
+                cnt, slon, slat, i = c
+                if cnt == 1:
+                    lon, lat = snap.features[i]['geometry']['coordinates']
+                else:
+                    lon, lat = slon / cnt, slat / cnt
+                xy = to_tile(lon, lat)
+                if xy is None:
+                    continue
+                if cnt == 1:
+                    props = summary_props(snap.features[i]['properties'])
+                    points.append(xy + (dict(props, count=1), int_id(props)))
+                else:
+                    points.append(xy + ({'count': cnt}, None))
+        return points
+
+    w, nth = unmercator((x - pad) / n, (y - pad) / n)
+    e, sth = unmercator((x + 1 + pad) / n, (y + 1 + pad) / n)
+    grid = snap.derive('grid', lambda s: GridIndex(s.features))
+    for i in grid.query(w, sth, e, nth):
+        xy = to_tile(grid.lon[i], grid.lat[i])
+        if xy is not None:
+            props = summary_props(snap.features[i]['properties'])
+            points.append(xy + (dict(props, count=1), int_id(props)))
+    return points
+
+class TileCache:
+    """LRU of encoded tiles for one snapshot, backed by TILE_CACHE_DIR/<data version>/z/x/y.mvt.
+
+    A new data version starts an empty LRU and removes the directories of older versions.
+    """
+
+    def __init__(self, marker, size=TILE_CACHE_SIZE, root=TILE_CACHE_DIR):
+        self.size = size
+        self.tiles = OrderedDict()
+        self.lock = threading.Lock()
+        self.dir = None
+        if root:
+            root = Path(root)
+            version = hashlib.sha1(repr(marker).encode('utf-8')).hexdigest()[:16]
+            self.dir = root / version
+            if root.is_dir():
+                for old in root.iterdir():
+                    if old.name != version:
+                        shutil.rmtree(old, ignore_errors=True)
+
+    def get(self, key, build):
+        with self.lock:
+            body = self.tiles.get(key)
+            if body is not None:
+                self.tiles.move_to_end(key)
+                return body
+        raw = self._read(key)
+        if raw is None:
+            raw = build()
+            self._write(key, raw)
+        body = compressed_body(raw, shared=True)
+        with self.lock:
+            self.tiles[key] = body
+            while len(self.tiles) > self.size:
+                self.tiles.popitem(last=False)
+        return body
+
+    def _path(self, key):
+        return self.dir / '{}/{}/{}.mvt'.format(*key)
+
+    def _read(self, key):
+        if self.dir is None:
+            return None
+        try:
+            return self._path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _write(self, key, raw):
+        if self.dir is None:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp%d' % threading.get_ident())
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)      # atomic: other workers never read a half-written tile
+        except OSError as e:
+            logging.warning('tile cache write failed: %s', e)
+
+@app.route('/tiles/wells/<int:z>/<int:x>/<int:y>.mvt')
+def well_tile(z, x, y):
+    if z > TILE_MAX_ZOOM or x >= (1 << z) or y >= (1 << z):
+        abort(404)
+    snap = get_snapshot()
+    cache = snap.derive('tiles', lambda s: TileCache(s.marker))
+    body = cache.get((z, x, y), lambda: encode_mvt('wells', tile_points(snap, z, x, y)))
+    return send_encoded(body, MVT_MIMETYPE)
+
+@app.route('/tiles/wells.json')
+def well_tilejson():
+    """TileJSON for the wells tiles, so a client knows the URL template, zoom range and bounds."""
+    snap = get_snapshot()
+    grid = snap.derive('grid', lambda s: GridIndex(s.features))
+    return jsonify({
+        'tilejson': '2.2.0',
+        'name': 'wells',
+        'tiles': [request.host_url.rstrip('/') + '/tiles/wells/{z}/{x}/{y}.mvt'],
+        'minzoom': 0,
+        'maxzoom': TILE_MAX_ZOOM,
+        'bounds': grid.extent,
+        'cluster_max_zoom': CLUSTER_MAX_ZOOM,
+        'total': len(snap.features),
+        'vector_layers': [{'id': 'wells', 'fields': dict({k: 'String' for k in SUMMARY_FIELDS},
+                                                          id='Number', count='Number')}],
+    })
 
 @app.route('/')
 def index():
@@ -4,79 +4,245 @@ L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
   attribution: '&copy; OpenStreetMap contributors'
 }).addTo(map);
 
-fetch('/api/wells').then(r=>r.json()).then(js=>{
-  const layer = L.geoJSON(js, {
-    pointToLayer: (feat, latlng) => L.marker(latlng),
-    onEachFeature: (feat, layer) => {
-      const raw = feat.properties || {};
-      // friendly labels
-      const LABELS = {
-        well_name_number: 'Well', api_number: 'API', operator_company: 'Operator', address: 'Address',
-        date_stimulated: 'Date', stimulated_formation: 'Formation', top_ft: 'Top (ft)', bottom_ft: 'Bottom (ft)',
-        stimulation_stages: 'Stages', volume_value: 'Volume', volume_units: 'Units', treatment_type: 'Treatment',
-        acid_percent: 'Acid %', lbs_proppant: 'Lbs Proppant', max_treatment_pressure_psi: 'Max Pressure (psi)',
-        max_treatment_rate_bbls_per_min: 'Max Rate (bbls/min)', details: 'Details'
-      };
+// popup HTML for one well's properties
+function popupHtml(raw) {
+  // friendly labels
+  const LABELS = {
+    well_name_number: 'Well', api_number: 'API', operator_company: 'Operator', address: 'Address',
+    date_stimulated: 'Date', stimulated_formation: 'Formation', top_ft: 'Top (ft)', bottom_ft: 'Bottom (ft)',
+    stimulation_stages: 'Stages', volume_value: 'Volume', volume_units: 'Units', treatment_type: 'Treatment',
+    acid_percent: 'Acid %', lbs_proppant: 'Lbs Proppant', max_treatment_pressure_psi: 'Max Pressure (psi)',
+    max_treatment_rate_bbls_per_min: 'Max Rate (bbls/min)', details: 'Details'
+  };
 
-      // filter/clean values (remove obvious header-like garbage)
-      function cleanVal(v){
-        if (v === null || v === undefined) return '';
-        v = String(v).trim();
-        if (!v) return '';
-        const low = v.toLowerCase();
-        // skip generic placeholders
-        const garbage = ['telephone number','city state zip code','state izp code','state izip code','i state zip code'];
-        for (const g of garbage) if (low.includes(g)) return '';
-        // trim repeated header-like long blocks
-        if (v.length > 800) return v.slice(0,800) + '...';
-        return v;
-      }
+  // filter/clean values (remove obvious header-like garbage)
+  function cleanVal(v){
+    if (v === null || v === undefined) return '';
+    v = String(v).trim();
+    if (!v) return '';
+    const low = v.toLowerCase();
+    // skip generic placeholders
+    const garbage = ['telephone number','city state zip code','state izp code','state izip code','i state zip code'];
+    for (const g of garbage) if (low.includes(g)) return '';
+    // trim repeated header-like long blocks
+    if (v.length > 800) return v.slice(0,800) + '...';
+    return v;
+  }
 
-      // build popup
-      const keys = Object.keys(LABELS);
-      let title = cleanVal(raw.well_name_number) || cleanVal(raw.api_number) || 'Unnamed';
-      let html = '<div>';
-      html += `<h3>${title}</h3>`;
-      html += '<table>';
-      for (const k of keys) {
-        const val = cleanVal(raw[k]);
-        if (val) {
-          html += `<tr><th style="text-align:left;padding:2px 8px;">${LABELS[k]}</th><td style="padding:2px 8px;">${val}</td></tr>`;
-        }
-      }
-      // also include any other non-empty properties not in LABELS (in case)
-      for (const k of Object.keys(raw)){
-        if (keys.indexOf(k) !== -1) continue;
-        const val = cleanVal(raw[k]);
-        if (val) html += `<tr><th style="text-align:left;padding:2px 8px;">${k}</th><td style="padding:2px 8px;">${val}</td></tr>`;
-      }
-      html += '</table>';
-      html += '</div>';
-      layer.bindPopup(html,{maxWidth:400});
+  // build popup
+  const keys = Object.keys(LABELS);
+  let title = cleanVal(raw.well_name_number) || cleanVal(raw.api_number) || 'Unnamed';
+  let html = '<div>';
+  html += `<h3>${title}</h3>`;
+  html += '<table>';
+  for (const k of keys) {
+    const val = cleanVal(raw[k]);
+    if (val) {
+      html += `<tr><th style="text-align:left;padding:2px 8px;">${LABELS[k]}</th><td style="padding:2px 8px;">${val}</td></tr>`;
     }
-  }).addTo(map);
+  }
+  // also include any other non-empty properties not in LABELS (in case)
+  for (const k of Object.keys(raw)){
+    if (keys.indexOf(k) !== -1) continue;
+    const val = cleanVal(raw[k]);
+    if (val) html += `<tr><th style="text-align:left;padding:2px 8px;">${k}</th><td style="padding:2px 8px;">${val}</td></tr>`;
+  }
+  html += '</table>';
+  html += '</div>';
+  return html;
+}
+
+function loadingHtml(props) {
+  return `<div><h3>${props.well_name_number || props.api_number || 'Unnamed'}</h3>Loading&hellip;</div>`;
+}
+
+// full row for one well, rendered as popup HTML
+function loadDetail(id) {
+  return fetch(`/api/wells/${encodeURIComponent(id)}`)
+    .then(r => { if (!r.ok) throw new Error(r.status); return r.json(); })
+    .then(f => popupHtml(f.properties || {}));
+}
 
-  // If we have features, fit map to their bounds
-  try {
-    const bounds = layer.getBounds();
-    if (bounds.isValid()) {
-      map.fitBounds(bounds.pad(0.1));
+// Clusters (zoomed out) are drawn as count bubbles; clicking one zooms in on it
+function clusterIcon(count) {
+  const size = count < 100 ? 30 : count < 1000 ? 38 : 46;
+  return L.divIcon({
+    html: `<div><span>${count}</span></div>`,
+    className: 'well-cluster',
+    iconSize: L.point(size, size)
+  });
+}
+
+const layer = L.geoJSON(null, {
+  pointToLayer: (feat, latlng) => feat.properties && feat.properties.cluster
+    ? L.marker(latlng, {icon: clusterIcon(feat.properties.count)})
+    : L.marker(latlng),
+  onEachFeature: (feat, layer) => {
+    const props = feat.properties || {};
+    if (props.cluster) {
+      layer.on('click', () => map.setView(layer.getLatLng(), Math.min(map.getZoom() + 2, map.getMaxZoom())));
+      return;
+    }
+    // list responses only carry id/name/API/status; the full row is fetched when the popup opens
+    if (props.id === undefined || props.id === '') {
+      layer.bindPopup(popupHtml(props),{maxWidth:400});
+      return;
     }
-  } catch (e) {
-    console.warn('Could not fit bounds:', e);
+    layer.bindPopup(loadingHtml(props),{maxWidth:400});
+    layer.on('popupopen', () => {
+      if (layer._detailLoaded) return;
+      loadDetail(props.id)
+        .then(html => { layer._detailLoaded = true; layer.setPopupContent(html); })
+        .catch(e => layer.setPopupContent(`<div>Failed to load well details: ${e.message}</div>`));
+    });
+  }
+}).addTo(map);
+
+// Small control showing how many wells are on screen
+const info = L.control({position: 'topright'});
+info.onAdd = function () {
+  const div = L.DomUtil.create('div', 'map-count-control');
+  div.style.padding = '6px 8px';
+  div.style.background = 'rgba(255,255,255,0.9)';
+  div.style.borderRadius = '4px';
+  div.style.boxShadow = '0 1px 2px rgba(0,0,0,0.2)';
+  this._div = div;
+  return div;
+};
+info.update = function (js) {
+  if (js.tilejson) {
+    this._div.innerHTML = `<strong>Wells:</strong> ${js.total}`;
+    return;
   }
+  if (js.zoom !== undefined) {
+    const n = (js.features || []).reduce((sum, f) => sum + (f.properties.count || 1), 0);
+    this._div.innerHTML = `<strong>Wells:</strong> ${n} here (clustered)`;
+    return;
+  }
+  const more = js.truncated ? ` of ${js.matched} here (zoom in for all)` : '';
+  this._div.innerHTML = `<strong>Wells:</strong> ${js.count !== undefined ? js.count : (js.features || []).length}${more} / ${js.total}`;
+};
+info.addTo(map);
 
-  // Add a small control showing count of markers
-  const count = (js.features || []).length;
-  const info = L.control({position: 'topright'});
-  info.onAdd = function () {
-    const div = L.DomUtil.create('div', 'map-count-control');
-    div.style.padding = '6px 8px';
-    div.style.background = 'rgba(255,255,255,0.9)';
-    div.style.borderRadius = '4px';
-    div.style.boxShadow = '0 1px 2px rgba(0,0,0,0.2)';
-    div.innerHTML = `<strong>Wells:</strong> ${count}`;
-    return div;
+// /api/wells.bin layout (see wells_columns.py): 24-byte header, then float64 lon[n], float64 lat[n], uint32 id[n]
+function readColumns(buf) {
+  const head = new DataView(buf, 0, 24);
+  if (String.fromCharCode(...new Uint8Array(buf, 0, 4)) !== 'WLC1' || head.getUint32(4, true) !== 2) {
+    throw new Error('bad wells buffer');
+  }
+  const n = head.getUint32(8, true), matched = head.getUint32(12, true), total = head.getUint32(16, true);
+  return {
+    count: n, matched, total, truncated: n < matched,
+    lon: new Float64Array(buf, 24, n),
+    lat: new Float64Array(buf, 24 + 8 * n, n),
+    id: new BigUint64Array(buf, 24 + 16 * n, n)   // uint64; ids are converted with Number() when used
   };
-  info.addTo(map);
-}).catch(e=>{console.error('failed to load wells',e); alert('Failed to load wells: '+e)});
+}
+
+function addColumns(cols) {
+  for (let i = 0; i < cols.count; i++) {
+    const marker = L.marker([cols.lat[i], cols.lon[i]]);
+    const id = Number(cols.id[i]);
+    marker.bindPopup(loadingHtml({}), {maxWidth: 400});
+    marker.on('popupopen', () => {
+      if (marker._detailLoaded) return;
+      loadDetail(id)
+        .then(html => { marker._detailLoaded = true; marker.setPopupContent(html); })
+        .catch(e => marker.setPopupContent(`<div>Failed to load well details: ${e.message}</div>`));
+    });
+    layer.addLayer(marker);
+  }
+}
+
+// Only the wells in the visible viewport are requested; panning/zooming asks again.
+// Up to the server's cluster max zoom the map shows clusters, closer in the individual wells.
+let clusterMaxZoom = 11;
+let inflight = null;
+let firstLoad = true;
+function loadViewport() {
+  if (inflight) inflight.abort();
+  inflight = new AbortController();
+  const b = map.getBounds();
+  const bbox = [b.getWest(), b.getSouth(), b.getEast(), b.getNorth()].map(v => v.toFixed(5)).join(',');
+  const z = map.getZoom();
+  // zoomed in, wells come as packed columns: no per-well JSON to parse
+  const binary = !firstLoad && z > clusterMaxZoom;
+  const url = z <= clusterMaxZoom
+    ? `/api/wells/clusters?bbox=${bbox}&z=${z}`
+    : binary ? `/api/wells.bin?bbox=${bbox}&zoom=${z}` : `/api/wells?bbox=${bbox}&zoom=${z}`;
+  fetch(url, {signal: inflight.signal})
+    .then(r => binary ? r.arrayBuffer().then(readColumns) : r.json())
+    .then(js => {
+      // first load: jump to where the data is (this moveend triggers the real viewport load)
+      if (firstLoad && js.extent) {
+        firstLoad = false;
+        const [w, s, e, n] = js.extent;
+        const bounds = L.latLngBounds([s, w], [n, e]);
+        if (bounds.isValid() && !map.getBounds().contains(bounds)) {
+          map.fitBounds(bounds.pad(0.1));
+          return;
+        }
+      }
+      firstLoad = false;
+      if (js.max_zoom !== undefined) clusterMaxZoom = js.max_zoom;
+      layer.clearLayers();
+      if (binary) addColumns(js); else layer.addData(js);
+      info.update(js);
+    })
+    .catch(e => {
+      if (e.name === 'AbortError') return;
+      console.error('failed to load wells', e);
+      alert('Failed to load wells: ' + e);
+    });
+}
+// Vector tiles (/tiles/wells/{z}/{x}/{y}.mvt): the server encodes each tile once and caches it, and
+// the browser draws points per tile instead of one DOM marker per well
+function fitExtent(extent) {
+  if (!extent) return;
+  const [w, s, e, n] = extent;
+  const bounds = L.latLngBounds([s, w], [n, e]);
+  if (bounds.isValid() && !map.getBounds().contains(bounds)) map.fitBounds(bounds.pad(0.1));
+}
+
+function loadTiles() {
+  fetch('/tiles/wells.json')
+    .then(r => r.json())
+    .then(tj => {
+      const tiles = L.vectorGrid.protobuf(tj.tiles[0], {
+        rendererFactory: L.canvas.tile,
+        interactive: true,
+        vectorTileLayerStyles: {
+          // count > 1 is a cluster; lone wells carry count 1
+          wells: props => props.count > 1
+            ? {radius: Math.min(8 + 2 * Math.log2(props.count), 24), fill: true, fillColor: '#3182bd',
+               fillOpacity: 0.85, color: '#fff', weight: 2}
+            : {radius: 5, fill: true, fillColor: '#e6550d', fillOpacity: 0.9, color: '#fff', weight: 1}
+        }
+      }).addTo(map);
+      tiles.on('click', e => {
+        const props = e.layer.properties || {};
+        if (props.count > 1) {
+          map.setView(e.latlng, Math.min(map.getZoom() + 2, map.getMaxZoom()));
+          return;
+        }
+        const popup = L.popup({maxWidth: 400}).setLatLng(e.latlng).setContent(loadingHtml(props)).openOn(map);
+        loadDetail(props.id)
+          .then(html => popup.setContent(html))
+          .catch(e => popup.setContent(`<div>Failed to load well details: ${e.message}</div>`));
+      });
+      info.update(tj);
+      fitExtent(tj.bounds);
+    })
+    .catch(e => {
+      console.error('failed to load well tiles', e);
+      alert('Failed to load wells: ' + e);
+    });
+}
+
+// GeoJSON viewport loading stays as the fallback when Leaflet.VectorGrid isn't available
+if (L.vectorGrid) {
+  loadTiles();
+} else {
+  map.on('moveend', loadViewport);
+  loadViewport();
+}
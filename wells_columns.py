@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Columnar export of the wells table for the map and for batch jobs.
+#
+# wells_columns.bin is a flat little-endian buffer that can be memory-mapped, or wrapped in JS typed arrays
+# without parsing anything per well:
+#
+#   offset 0           header: magic b"WLC1", then uint32 version, count, matched, total, reserved  (24 bytes)
+#   offset 24          float64 lon[count]
+#   offset 24 + 8n     float64 lat[count]
+#   offset 24 + 16n    uint64  id[count]   (version 1 had uint32 ids)
+#
+# matched/total only differ from count in viewport responses from /api/wells.bin.
+# --parquet also writes every column of the table to Parquet (needs the optional pyarrow package).
+#
+#   python3 wells_columns.py --out wells_columns.bin --parquet wells.parquet
+
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+
+try:
+    import pyarrow as pa            # optional: Parquet export
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+MAGIC = b"WLC1"
+VERSION = 2
+HEADER = struct.Struct("<4sIIIII")
+assert HEADER.size % 8 == 0        # keeps the float64 columns 8-byte aligned
+ID_CODE = "Q"                      # array code for the id column; "I" is only guaranteed 16 bits, "Q" is 64
+assert array(ID_CODE).itemsize == 8
+
+
+def _le(a):
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+def pack_columns(ids, lons, lats, matched=None, total=None):
+    n = len(ids)
+    header = HEADER.pack(MAGIC, VERSION, n, n if matched is None else matched, n if total is None else total, 0)
+    return header + _le(array("d", lons)) + _le(array("d", lats)) + _le(array(ID_CODE, ids))
+
+
+def read_columns(buf):
+    """Columns of a packed buffer (bytes, mmap, ...). On little-endian hosts they are zero-copy memoryviews."""
+    magic, version, n, matched, total, _ = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a wells column buffer (magic={magic!r}, version={version})")
+    view = memoryview(buf)
+    o = HEADER.size
+    spans = {"lon": ("d", o, o + 8 * n), "lat": ("d", o + 8 * n, o + 16 * n), "id": (ID_CODE, o + 16 * n, o + 24 * n)}
+    cols = {"count": n, "matched": matched, "total": total}
+    for name, (code, start, end) in spans.items():
+        if sys.byteorder == "little":
+            cols[name] = view[start:end].cast(code)
+        else:
+            a = array(code, view[start:end].tobytes())
+            a.byteswap()
+            cols[name] = a
+    return cols
+
+
+def open_columns(path):
+    """Memory-map an exported file. The mmap stays open as long as the returned columns are referenced."""
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return read_columns(mm)
+
+
+def _coord(row, keys):
+    # the first non-empty key wins, then is parsed (as in the webapp): a bad lat doesn't fall back to latitude
+    v = next((row.get(k) for k in keys if row.get(k) not in (None, "")), None)
+    try:
+        return None if v is None else float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_rows():
+    from db_pool import connection
+    with connection() as conn:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT * FROM wells ORDER BY id")
+        rows = cur.fetchall()
+        cur.close()
+    return rows
+
+
+def write_columns(path, rows):
+    """Mappable wells only, picked like the webapp does: the first non-empty of lat/latitude and of
+    lon/longitude must parse as a number. Returns the count."""
+    ids, lons, lats = [], [], []
+    for r in rows:
+        lat = _coord(r, ("lat", "latitude"))
+        lon = _coord(r, ("lon", "longitude"))
+        if lat is None or lon is None or r.get("id") is None:
+            continue
+        ids.append(int(r["id"]))
+        lons.append(lon)
+        lats.append(lat)
+    with open(path, "wb") as fh:
+        fh.write(pack_columns(ids, lons, lats))
+    return len(ids)
+
+
+def write_parquet(path, rows):
+    if pq is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    pq.write_table(pa.Table.from_pylist(rows), path, compression="zstd")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Export the wells table as columnar files")
+    ap.add_argument("--out", default="wells_columns.bin", help="Packed lon/lat/id buffer")
+    ap.add_argument("--parquet", help="Also write all columns to this Parquet file")
+    args = ap.parse_args()
+
+    rows = fetch_rows()
+    n = write_columns(args.out, rows)
+    print(f"Wrote {n} of {len(rows)} wells to {args.out}")
+    if args.parquet:
+        write_parquet(args.parquet, rows)
+        print(f"Wrote {len(rows)} rows to {args.parquet}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,55 @@
 #!/usr/bin/env python3
-# Append-only: inserts one row per PDF (no ON DUPLICATE KEY UPDATE).
+# Incremental: one row per PDF; an ingestion manifest skips unchanged PDFs on re-runs
+# and changed PDFs update the row they produced last time instead of appending.
 # Rock-solid "Well Name and Number" extraction:
 # - Supports: "Well Name and Number or Facility Name", "Well or Facility Name", "Well Name and Number"
 # - Captures only the value AFTER the label (no label text in result)
 # - If value contains "see", skips and finds next occurrence
 
-import os, re, sys, argparse, tempfile, subprocess, logging
+import os, re, sys, argparse, tempfile, subprocess, logging, hashlib, time, json, csv, heapq, math
+from contextlib import contextmanager, nullcontext
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Optional, Tuple
 import pandas as pd
 from dotenv import load_dotenv
-import mysql.connector as mysql
+from db_pool import get_connection
 from datetime import datetime
 for name in ("pdfminer", "pdfminer.pdfinterp", "pdfminer.layout", "pdfminer.pdfpage", "pdfminer.cmapdb"):
     logging.getLogger(name).setLevel(logging.ERROR)
 
 load_dotenv()
 
-def db_conn():
-    return mysql.connect(
-        host=os.getenv("MYSQL_HOST", "localhost"),
-        user=os.getenv("MYSQL_USER"),
-        password=os.getenv("MYSQL_PASSWORD"),
-        database=os.getenv("MYSQL_DB", "wells_db"),
-        port=int(os.getenv("MYSQL_PORT", "3306")),
-        autocommit=True,
-    )
+def db_conn(**extra):
+    # shared pool (db_pool.py); extra connect flags such as allow_local_infile get a pool of their own
+    return get_connection(autocommit=True, **extra)
 
 TABLE = os.getenv("MYSQL_TABLE", "wells")
-INSERT_SQL = f"""
+WELL_COLS = [
+    "operator_company","well_name_number","api_number","job_type","address",
+    "longitude","latitude","date_stimulated","stimulated_formation",
+    "top_ft","bottom_ft","stimulation_stages","volume_value","volume_units",
+    "treatment_type","acid_percent","lbs_proppant",
+    "max_treatment_pressure_psi","max_treatment_rate_bbls_per_min","details",
+]
+# id=NULL inserts a new row; a known id (from the manifest) overwrites that row in place
+UPSERT_SQL = f"""
+INSERT INTO {TABLE}
+(id, {", ".join(WELL_COLS)})
+VALUES (%s, {", ".join(["%s"] * len(WELL_COLS))})
+ON DUPLICATE KEY UPDATE {", ".join(f"{c}=VALUES({c})" for c in WELL_COLS)}
+"""
+
+# load-data mode stages each batch here, then merges it with the same column list as UPSERT_SQL
+LOAD_STAGE_TABLE = f"{TABLE}_load_stage"
+LOAD_MERGE_SQL = f"""
 INSERT INTO {TABLE}
-(operator_company, well_name_number, api_number, job_type, address,
- longitude, latitude, date_stimulated, stimulated_formation,
- top_ft, bottom_ft, stimulation_stages, volume_value, volume_units,
- treatment_type, acid_percent, lbs_proppant,
- max_treatment_pressure_psi, max_treatment_rate_bbls_per_min, details)
-VALUES (%s,%s,%s,%s,%s,
-        %s,%s,%s,%s,
-        %s,%s,%s,%s,%s,
-        %s,%s,%s,
-        %s,%s,%s)
+(id, {", ".join(WELL_COLS)})
+SELECT id, {", ".join(WELL_COLS)} FROM {LOAD_STAGE_TABLE}
+ON DUPLICATE KEY UPDATE {", ".join(f"{c}=VALUES({c})" for c in WELL_COLS)}
 """
 
 def ensure_table(conn):
@@ -72,48 +82,400 @@ def ensure_table(conn):
     """)
     cur.close()
 
+# Ingestion manifest: bump PARSER_VERSION when parse_pdf output changes to force a re-parse
+PARSER_VERSION = "3"     # 3: overlapping details windows are merged
+MANIFEST_TABLE = f"{TABLE}_ingest_manifest"
+
+def ensure_manifest(conn):
+    cur = conn.cursor()
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+      path VARCHAR(768) PRIMARY KEY,
+      size_bytes BIGINT,
+      mtime DOUBLE,
+      content_sha256 CHAR(64),
+      parser_version VARCHAR(32),
+      row_id BIGINT UNSIGNED,
+      ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+    cur.close()
+
+def load_manifest(conn) -> Dict[str, Dict]:
+    cur = conn.cursor(dictionary=True)
+    cur.execute(f"SELECT path, size_bytes, mtime, content_sha256, parser_version, row_id FROM {MANIFEST_TABLE}")
+    out = {r["path"]: r for r in cur.fetchall()}
+    cur.close()
+    return out
+
+MANIFEST_UPSERT_SQL = f"""
+INSERT INTO {MANIFEST_TABLE} (path, size_bytes, mtime, content_sha256, parser_version, row_id)
+VALUES (%s,%s,%s,%s,%s,%s)
+ON DUPLICATE KEY UPDATE size_bytes=VALUES(size_bytes), mtime=VALUES(mtime),
+  content_sha256=VALUES(content_sha256), parser_version=VALUES(parser_version), row_id=VALUES(row_id)
+"""
+
+def manifest_params(entry: Dict) -> Tuple:
+    return (entry["path"], entry["size_bytes"], entry["mtime"], entry["content_sha256"],
+            entry["parser_version"], entry["row_id"])
+
+def save_manifest_entry(cur, entry: Dict) -> None:
+    cur.execute(MANIFEST_UPSERT_SQL, manifest_params(entry))
+
+def manifest_key(p: Path) -> str:
+    return str(p.resolve())
+
+def manifest_check(p: Path, manifest: Dict[str, Dict]) -> Tuple[Dict, bool]:
+    """Return (fresh manifest entry, needs_ingest). Only hashes when size/mtime moved."""
+    st = p.stat()
+    key = manifest_key(p)
+    old = manifest.get(key)
+    entry = {"path": key, "size_bytes": st.st_size, "mtime": st.st_mtime,
+             "content_sha256": old["content_sha256"] if old else None,
+             "parser_version": PARSER_VERSION, "row_id": old["row_id"] if old else None}
+    same_parser = bool(old) and old["parser_version"] == PARSER_VERSION and old["row_id"] is not None
+    if same_parser and old["size_bytes"] == st.st_size and old["mtime"] == st.st_mtime:
+        return entry, False
+    entry["content_sha256"] = file_sha256(p)
+    if same_parser and old["content_sha256"] == entry["content_sha256"]:
+        return entry, False   # touched but identical; caller refreshes size/mtime
+    return entry, True
+
+# Profiling (--profile): wall time per parser stage, collected per file by the worker
+PROFILE = {"on": False, "times": {}}
+_NO_TIMER = nullcontext()
+
+@contextmanager
+def _timed(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        times = PROFILE["times"]
+        times[name] = times.get(name, 0.0) + time.perf_counter() - t0
+
+def stage(name: str):
+    """`with stage("ocr"): ...` adds the block's wall time to PROFILE["times"][name] when profiling."""
+    return _timed(name) if PROFILE["on"] else _NO_TIMER
+
+def _percentile(vals: List[float], q: float) -> float:
+    # nearest-rank on a sorted list
+    if not vals:
+        return 0.0
+    return vals[min(len(vals) - 1, max(0, math.ceil(q / 100.0 * len(vals)) - 1))]
+
+def write_profile_report(out_dir: Path, per_file: List[Tuple[Path, Dict[str, float]]],
+                         run_stages: Dict[str, float], top: int = 10) -> Dict:
+    """Write stage_times.csv (one row per file) and stage_summary.json (p50/p95 per stage, slowest files)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    names = sorted({k for _, t in per_file for k in t if k != "total"})
+    with open(out_dir / "stage_times.csv", "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(["file", "total", *names])
+        for f, t in per_file:
+            w.writerow([str(f), f"{t.get('total', 0.0):.6f}", *(f"{t.get(k, 0.0):.6f}" for k in names)])
+
+    stages = {}
+    for k in names + ["total"]:
+        vals = sorted(t.get(k, 0.0) for _, t in per_file)
+        stages[k] = {"sum": sum(vals), "mean": sum(vals) / len(vals) if vals else 0.0,
+                     "p50": _percentile(vals, 50), "p95": _percentile(vals, 95),
+                     "max": vals[-1] if vals else 0.0}
+    slowest = sorted(per_file, key=lambda ft: ft[1].get("total", 0.0), reverse=True)[:top]
+    summary = {
+        "files": len(per_file),
+        "stages": stages,
+        "run": run_stages,      # whole-run stages that aren't per file (manifest scan, DB writes)
+        "slowest": [{"file": str(f), **t} for f, t in slowest],
+    }
+    with open(out_dir / "stage_summary.json", "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+    return summary
+
 # OCR
 def _have(cmd: str) -> bool:
     from shutil import which
     return which(cmd) is not None
 
-def ocr_pdf_if_needed(src_pdf: Path) -> Path:
-    if not _have("ocrmypdf"):
-        return src_pdf
-    out = Path(tempfile.gettempdir()) / f"ocr_{src_pdf.stem}.pdf"
-    try:
+OCR_ARGS = ["--skip-text", "--fast-web-view", "1", "--rotate-pages", "--deskew"]
+
+# Persistent OCR cache, LRU by mtime (touched on hit): <dir>/<sha256(pdf bytes + ocr args)>.pdf for
+# whole-file OCR, .json holding just the OCR'd pages' text for page OCR
+OCR_CACHE = {
+    "dir": os.getenv("OCR_CACHE_DIR", str(Path.home() / ".cache" / "wells_ocr")),
+    "max_bytes": int(float(os.getenv("OCR_CACHE_MAX_MB", "2048")) * 1024 * 1024),
+}
+OCR_STATS = {"ocr_cache_hit": 0, "ocr_cache_miss": 0}
+
+def configure_ocr_cache(cache_dir: Optional[str], max_mb: Optional[float] = None) -> None:
+    # Also used as the process-pool initializer so workers see the CLI settings.
+    OCR_CACHE["dir"] = cache_dir or None
+    if max_mb is not None:
+        OCR_CACHE["max_bytes"] = int(max_mb * 1024 * 1024)
+
+def file_sha256(path: Path, bufsize: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(bufsize), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    return file_sha256(Path(path))
+
+def cached_sha256(path: Path) -> str:
+    # hashed once per (path, size, mtime) in this process; streaming OCR needs it once per window
+    st = path.stat()
+    return _file_digest(str(path), st.st_size, st.st_mtime_ns)
+
+def _ocr_cache_key(src_pdf: Path, args: List[str]) -> str:
+    h = hashlib.sha256(cached_sha256(src_pdf).encode())
+    h.update("\0".join(args).encode())
+    return h.hexdigest()
+
+def _evict_ocr_cache(cache_dir: Path, max_bytes: int) -> None:
+    entries = []
+    for p in [*cache_dir.glob("*.pdf"), *cache_dir.glob("*.json")]:
+        try:
+            st = p.stat()
+        except FileNotFoundError:   # another worker evicted it
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+    total = sum(e[1] for e in entries)
+    for _, size, p in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+
+def _run_ocrmypdf(src_pdf: Path, out: Path, args: List[str]) -> None:
+    with stage("ocr"):
         subprocess.run(
-            ["ocrmypdf", "--skip-text", "--fast-web-view", "1", "--rotate-pages", "--deskew",
-             str(src_pdf), str(out)],
+            ["ocrmypdf", *args, str(src_pdf), str(out)],
             check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
+
+def _ocr_to_cache(src_pdf: Path, args: List[str], cache_dir: Path) -> Path:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    out = cache_dir / f"{_ocr_cache_key(src_pdf, args)}.pdf"
+    if out.exists():
+        OCR_STATS["ocr_cache_hit"] += 1
+        os.utime(out)
         return out
-    except Exception:
-        return src_pdf
+    OCR_STATS["ocr_cache_miss"] += 1
+    # write beside the final name, then rename, so concurrent workers never see a partial file
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".pdf", dir=str(cache_dir))
+    os.close(fd)
+    try:
+        _run_ocrmypdf(src_pdf, Path(tmp), args)
+        os.replace(tmp, out)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    _evict_ocr_cache(cache_dir, OCR_CACHE["max_bytes"])
+    return out if out.exists() else src_pdf
+
+@contextmanager
+def ocr_pdf_if_needed(src_pdf: Path, args: Optional[List[str]] = None):
+    """with ocr_pdf_if_needed(pdf) as ocrd: ... -- the OCR'd PDF, or src_pdf if OCR is unavailable or fails.
+    Without a cache the output is a temp file that is deleted when the block exits."""
+    if not _have("ocrmypdf"):
+        yield src_pdf
+        return
+    args = OCR_ARGS if args is None else args
+    if OCR_CACHE["dir"]:
+        try:
+            out = _ocr_to_cache(src_pdf, args, Path(OCR_CACHE["dir"]))
+        except Exception:
+            out = src_pdf
+        yield out
+        return
+    with tempfile.TemporaryDirectory(prefix="ocr_") as tmp:
+        out = Path(tmp) / src_pdf.name
+        try:
+            _run_ocrmypdf(src_pdf, out, args)
+        except Exception:
+            out = src_pdf
+        yield out
 
-def extract_text_pages(pdf_path: Path) -> List[str]:
-    texts = []
+# Pages whose text layer is below this many non-blank chars per square inch get OCR'd
+OCR_MIN_CHARS_PER_SQIN = float(os.getenv("OCR_MIN_CHARS_PER_SQIN", "0.5"))
+# --force-ocr rather than --skip-text: a page with a stray stamp/footer still needs OCR
+OCR_PAGE_ARGS = ["--force-ocr", "--rotate-pages", "--deskew"]
+
+def _plumber_page(p) -> Tuple[str, float]:
     try:
-        import pdfplumber
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            for p in pdf.pages:
-                try:
-                    t = p.extract_text(x_tolerance=2, y_tolerance=2) or ""
-                except Exception:
-                    t = ""
-                texts.append(t)
-        if any(texts): return texts
+        t = p.extract_text(x_tolerance=2, y_tolerance=2) or ""
     except Exception:
-        pass
+        t = ""
+    sqin = (float(p.width) * float(p.height)) / (72.0 * 72.0)
+    return t, (len(re.sub(r"\s+", "", t)) / sqin if sqin > 0 else 0.0)
+
+def _release_page(p) -> None:
+    # drop pdfplumber's cached layout objects so finished pages can be garbage collected
+    release = getattr(p, "close", None) or getattr(p, "flush_cache", None)
+    if release:
+        release()
+
+def _plumber_pages(pdf_path: Path, only: Optional[set] = None) -> Tuple[List[str], List[float]]:
+    """Per-page pdfplumber text and text density; pages not in `only` are left empty."""
+    import pdfplumber
+    texts, density = [], []
+    with stage("pdfplumber"), pdfplumber.open(str(pdf_path)) as pdf:
+        for i, p in enumerate(pdf.pages):
+            if only is not None and i not in only:
+                texts.append(""); density.append(0.0)
+                continue
+            t, d = _plumber_page(p)
+            _release_page(p)
+            texts.append(t); density.append(d)
+    return texts, density
+
+def _iter_pypdf2_pages(pdf_path: Path):
     try:
         from PyPDF2 import PdfReader
-        r = PdfReader(str(pdf_path))
+        with stage("pypdf2"):
+            r = PdfReader(str(pdf_path))
         for p in r.pages:
-            try: texts.append(p.extract_text() or "")
-            except Exception: texts.append("")
+            with stage("pypdf2"):
+                try: t = p.extract_text() or ""
+                except Exception: t = ""
+            yield t
     except Exception:
         pass
-    return texts
+
+def _pypdf2_pages(pdf_path: Path) -> List[str]:
+    return list(_iter_pypdf2_pages(pdf_path))
+
+def _page_spec(idxs: List[int]) -> str:
+    # 0-based indexes -> ocrmypdf 1-based "--pages" spec, e.g. [0,1,2,5] -> "1-3,6"
+    out, run = [], []
+    for i in sorted(idxs):
+        if run and i == run[-1] + 1:
+            run.append(i); continue
+        if run: out.append(run)
+        run = [i]
+    if run: out.append(run)
+    return ",".join(f"{r[0]+1}-{r[-1]+1}" if len(r) > 1 else f"{r[0]+1}" for r in out)
+
+def extract_text_pages(pdf_path: Path) -> List[str]:
+    # 1) text layer first; 2) OCR only the sparse pages and merge them back in page order
+    try:
+        texts, density = _plumber_pages(pdf_path)
+    except Exception:
+        texts, density = [], []
+
+    if not texts:
+        # pdfplumber couldn't read the file at all: OCR all of it, then retry / fall back to PyPDF2
+        with ocr_pdf_if_needed(pdf_path) as ocrd:
+            try:
+                texts, _ = _plumber_pages(ocrd)
+            except Exception:
+                texts = []
+            return texts if any(texts) else _pypdf2_pages(ocrd)
+
+    _merge_ocr_pages(pdf_path, texts, [i for i, d in enumerate(density) if d < OCR_MIN_CHARS_PER_SQIN])
+    return texts if any(texts) else _pypdf2_pages(pdf_path)
+
+def _ocr_page_texts(pdf_path: Path, sparse: List[int]) -> Dict[int, str]:
+    """OCR text of the given 0-based pages, from one ocrmypdf run. The cache stores only these
+    pages' text, so windowed OCR of a long scan doesn't keep a full-size PDF per window."""
+    if not _have("ocrmypdf"):
+        return {}
+    args = OCR_PAGE_ARGS + ["--pages", _page_spec(sparse)]
+    cache_dir = Path(OCR_CACHE["dir"]) if OCR_CACHE["dir"] else None
+    entry = None
+    if cache_dir is not None:
+        try:
+            entry = cache_dir / f"{_ocr_cache_key(pdf_path, args)}.json"
+            with open(entry, encoding="utf-8") as fh:
+                pages = {int(k): v for k, v in json.load(fh).items()}
+            OCR_STATS["ocr_cache_hit"] += 1
+            os.utime(entry)
+            return pages
+        except (OSError, ValueError):
+            pass
+        OCR_STATS["ocr_cache_miss"] += 1
+    with tempfile.TemporaryDirectory(prefix="ocr_") as tmp:
+        out = Path(tmp) / pdf_path.name
+        try:
+            _run_ocrmypdf(pdf_path, out, args)
+            otexts, _ = _plumber_pages(out, only=set(sparse))
+        except Exception:
+            return {}
+    pages = {i: otexts[i] for i in sparse if i < len(otexts)}
+    if entry is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=str(cache_dir))
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(pages, fh)
+            os.replace(tmp, entry)
+            _evict_ocr_cache(cache_dir, OCR_CACHE["max_bytes"])
+        except OSError:
+            pass
+    return pages
+
+def _merge_ocr_pages(pdf_path: Path, texts, sparse: List[int]) -> None:
+    """OCR the given 0-based pages in one ocrmypdf run and swap in the OCR text where it's longer."""
+    if not sparse:
+        return
+    otexts = _ocr_page_texts(pdf_path, sparse)
+    for i in sparse:
+        t = otexts.get(i, "")
+        if len(t.strip()) > len(texts[i].strip()):
+            texts[i] = t
+
+# Streaming extraction holds at most this many pages; sparse pages are OCR'd once per window
+OCR_STREAM_WINDOW = int(os.getenv("OCR_STREAM_WINDOW", "32"))
+
+def iter_text_pages(pdf_path: Path, window: int = OCR_STREAM_WINDOW):
+    """Generator form of extract_text_pages: same page texts, at most `window` held at once."""
+    try:
+        import pdfplumber
+        with stage("pdfplumber"):
+            pdf = pdfplumber.open(str(pdf_path))
+    except Exception:
+        yield from extract_text_pages(pdf_path)   # unreadable by pdfplumber: whole-file OCR path
+        return
+
+    def flush(buf):
+        texts = {i: t for i, t, _ in buf}
+        _merge_ocr_pages(pdf_path, texts, [i for i, _, d in buf if d < OCR_MIN_CHARS_PER_SQIN])
+        return [texts[i] for i, _, _ in buf]
+
+    # Leading empty pages are only counted, so an all-empty file can still fall back to PyPDF2
+    # (extract_text_pages' `any(texts)` check) without having yielded anything.
+    held_empty, seen_text = 0, False
+    with pdf:
+        buf = []
+        pages = iter(enumerate(pdf.pages))
+        while True:
+            item = next(pages, None)
+            if item is not None:
+                i, p = item
+                with stage("pdfplumber"):
+                    buf.append((i, *_plumber_page(p)))
+                    _release_page(p)
+            if buf and (item is None or len(buf) >= window):
+                for t in flush(buf):
+                    if seen_text:
+                        yield t
+                    elif t:
+                        yield from [""] * held_empty
+                        yield t
+                        seen_text = True
+                    else:
+                        held_empty += 1
+                buf = []
+            if item is None:
+                break
+    if not seen_text:
+        yield from _iter_pypdf2_pages(pdf_path)
 
 STOP_AT = re.compile(
     r"\b(Qtr(?:-?Qtr)?|Quarter(?:-Quarter)?|Section|Township|Range|County|"
@@ -218,24 +580,103 @@ def extract_value_after_label(lines: List[str], pats: List[re.Pattern], start_id
             return (val or None, i)
     return (None, -1)
 
+def _value_after_match(lines: List[str], i: int, m: re.Match, max_next: int = 2) -> Optional[str]:
+    val = lines[i][m.end():].strip(" :.-")
+    if not val:
+        for j in range(1, max_next+1):
+            if i + j < len(lines):
+                cand = lines[i+j].strip()
+                if STOP_AT.search(cand): break
+                val = cand; break
+    val = trim_spillover(val)
+    return val or None
+
 def extract_value_near_label(lines: List[str], label_pat: re.Pattern, start_idx: int = 0, max_next: int = 2) -> Tuple[Optional[str], int]:
     """Generic helper for other fields (not Well Name)."""
     for i in range(start_idx, len(lines)):
-        ln = lines[i]
-        m = label_pat.search(ln)
+        m = label_pat.search(lines[i])
         if not m: 
             continue
-        val = ln[m.end():].strip(" :.-")
-        if not val:
-            for j in range(1, max_next+1):
-                if i + j < len(lines):
-                    cand = lines[i+j].strip()
-                    if STOP_AT.search(cand): break
-                    val = cand; break
-        val = trim_spillover(val)
-        return (val or None, i)
+        return (_value_after_match(lines, i, m, max_next), i)
     return (None, -1)
 
+# A literal every LP pattern needs (lowercase); lets scan_labels skip most lines without running
+# the label regexes. Exact for ASCII lines; non-ASCII lines always get the full patterns.
+LABEL_KEYWORDS = {
+    "operator_company": ("operator",),
+    "api_number": ("api",),
+    "address": ("address",),
+    "date_stimulated": ("date",),
+    "stimulated_formation": ("formation",),
+    "job_type": ("type",),
+    "top_ft": ("top",),
+    "bottom_ft": ("bottom",),
+    "stimulation_stages": ("stage",),
+    "volume": ("fluid", "volume"),
+    "acid_percent": ("acid",),
+    "lbs_proppant": ("proppant",),
+    "max_pressure": ("pressure",),
+    "max_rate": ("rate",),
+}
+
+@lru_cache(maxsize=None)
+def _label_prefilter(keys: Tuple[str, ...]) -> Optional[re.Pattern]:
+    if any(k not in LABEL_KEYWORDS for k in keys):
+        return None
+    return re.compile("|".join(re.escape(w) for k in keys for w in LABEL_KEYWORDS[k]))
+
+class LabelScanner:
+    """Incremental scan_labels: feed lines in order, read .out once done (or at end of input).
+
+    Lines without any remaining field's keyword are skipped with one literal search, and a
+    field stops being tested once it has its first hit. A hit with nothing after the label
+    waits for the next line, like extract_value_near_label's look-ahead.
+    """
+
+    def __init__(self, pats: Dict[str, re.Pattern]):
+        self.todo = dict(pats)
+        self.out: Dict[str, Optional[str]] = {k: None for k in pats}
+        self.pending: List[str] = []
+        self.pre = _label_prefilter(tuple(self.todo))
+
+    @property
+    def done(self) -> bool:
+        return not self.todo and not self.pending
+
+    def feed(self, ln: str) -> None:
+        if self.pending:
+            cand = ln.strip()
+            val = trim_spillover("" if STOP_AT.search(cand) else cand) or None
+            for key in self.pending:
+                self.out[key] = val
+            self.pending = []
+        if not self.todo:
+            return
+        if self.pre is not None and ln.isascii() and not self.pre.search(ln.lower()):
+            return
+        hit = False
+        for key, pat in list(self.todo.items()):
+            m = pat.search(ln)
+            if m:
+                val = ln[m.end():].strip(" :.-")
+                if val:
+                    self.out[key] = trim_spillover(val) or None
+                else:
+                    self.pending.append(key)
+                del self.todo[key]
+                hit = True
+        if hit and self.todo:
+            self.pre = _label_prefilter(tuple(self.todo))
+
+def scan_labels(lines: List[str], pats: Dict[str, re.Pattern]) -> Dict[str, Optional[str]]:
+    """One pass over lines; same result as extract_value_near_label(lines, pat)[0] for every pat."""
+    sc = LabelScanner(pats)
+    for ln in lines:
+        sc.feed(ln)
+        if sc.done:
+            break
+    return sc.out
+
 def _is_plausible_well_name(s: str) -> bool:
     if not s: return False
     s = s.strip(" :.-").strip()
@@ -254,37 +695,86 @@ def _is_plausible_well_name(s: str) -> bool:
     if any(bt in low for bt in bad_tokens): return False
     return True
 
+_WELL_LABEL_AGAIN = re.compile(r"well\s*(?:name\s*)?(?:and|&|/)?\s*(?:number|no\.?)|facility\s*name", re.I)
+_WELL_LABEL_PREFIX = re.compile(
+    r'^(?:Well\s*Name\s*and\s*Number\s*or\s*Facility\s*Name|'
+    r'Well\s*or\s*Facility\s*Name|'
+    r'Well\s*Name\s*and\s*Number)\s*[:：-]?\s*', re.I)
+
+class WellNameScanner:
+    """Incremental extract_well_name.
+
+    Keeps only the lines that carry a WELL_LABELS match (with the 5 lines after each) and
+    the first 80 lines for the fallback, then replays extract_well_name's search over them.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.head: List[str] = []
+        self.hits: List[Tuple[int, Dict[int, str], List[str]]] = []
+        self.open: List[List[str]] = []
+
+    def feed(self, ln: str) -> None:
+        for nxt in self.open:
+            nxt.append(ln)
+        if self.open:
+            self.open = [nxt for nxt in self.open if len(nxt) < 5]
+        if len(self.head) < 80:
+            self.head.append(ln)
+        # every WELL_LABELS pattern starts with "Well"
+        if not ln.isascii() or "well" in ln.lower():
+            vals = {}
+            for k, pat in enumerate(WELL_LABELS):
+                m = pat.search(ln)
+                if m:
+                    vals[k] = m.group("val") or ""
+            if vals:
+                nxt: List[str] = []
+                self.hits.append((self.n, vals, nxt))
+                self.open.append(nxt)
+        self.n += 1
+
+    def _next_label(self, start_idx: int):
+        # extract_value_after_label order: earlier WELL_LABELS pattern first, then earliest line
+        for k in range(len(WELL_LABELS)):
+            for where, vals, nxt in self.hits:
+                if where >= start_idx and k in vals:
+                    return where, vals[k], nxt
+        return None
+
+    def result(self) -> Optional[str]:
+        idx = 0
+        while True:
+            hit = self._next_label(idx)
+            if hit is None:
+                break
+            where, raw, nxt = hit
+            val = trim_spillover(raw.strip(" :.-")) or None
+            for cand in nxt:
+                cand = cand.strip()
+                if not cand: continue
+                if STOP_AT.search(cand) or _WELL_LABEL_AGAIN.search(cand): break
+                if re.search(r"\bsee\b", cand, re.I): continue
+                cand = cut_after_markers(cand)
+                if _is_plausible_well_name(cand): 
+                    return cand
+            if val and not re.search(r"\bsee\b", val, re.I):
+                val = cut_after_markers(val)
+                if _is_plausible_well_name(val):
+                    return val
+            idx = where + 1
+        for ln in self.head:
+            s = _WELL_LABEL_PREFIX.sub("", ln).strip()
+            s = cut_after_markers(s)
+            if _is_plausible_well_name(s) and re.search(r"[A-Za-z].*\d|\d.*[A-Za-z]", s):
+                return s
+        return None
+
 def extract_well_name(lines: List[str]) -> Optional[str]:
-    idx = 0
-    label_again = re.compile(r"well\s*(?:name\s*)?(?:and|&|/)?\s*(?:number|no\.?)|facility\s*name", re.I)
-    while True:
-        val, where = extract_value_after_label(lines, WELL_LABELS, start_idx=idx, max_next=0)
-        if where < 0:
-            break
-        for j in range(1, 6):
-            if where + j >= len(lines): break
-            cand = lines[where + j].strip()
-            if not cand: continue
-            if STOP_AT.search(cand) or label_again.search(cand): break
-            if re.search(r"\bsee\b", cand, re.I): continue
-            cand = cut_after_markers(cand)
-            if _is_plausible_well_name(cand): 
-                return cand
-        if val and not re.search(r"\bsee\b", val, re.I):
-            val = cut_after_markers(val)
-            if _is_plausible_well_name(val):
-                return val
-        idx = where + 1
-    label_prefix = re.compile(
-        r'^(?:Well\s*Name\s*and\s*Number\s*or\s*Facility\s*Name|'
-        r'Well\s*or\s*Facility\s*Name|'
-        r'Well\s*Name\s*and\s*Number)\s*[:：-]?\s*', re.I)
-    for ln in lines[:80]:
-        s = label_prefix.sub("", ln).strip()
-        s = cut_after_markers(s)
-        if _is_plausible_well_name(s) and re.search(r"[A-Za-z].*\d|\d.*[A-Za-z]", s):
-            return s
-    return None
+    sc = WellNameScanner()
+    for ln in lines:
+        sc.feed(ln)
+    return sc.result()
 
 # ---------- Coordinates: scan WHOLE PDF and pick the best LAT/LON pair (strict hemi rules) ----------
 
@@ -379,12 +869,54 @@ def _nd_pref(val: float, is_lat: bool) -> bool:
         return 45.0 <= val <= 50.0
     return -105.5 <= val <= -96.0
 
+# Every character DMS_FLEX / DEC_ANY can consume (same re.I folding). Matches never cross a run
+# of these, so the heavy patterns only run inside runs that could yield a kept candidate:
+# DMS needs a hemisphere letter (hemi-less DMS hits are dropped anyway), decimal needs d.d
+_COORD_CH = re.compile(r"""[\dNSEWo\s:/\-+.°º"”“″]*""", re.I)
+_DIGIT = re.compile(r"\d")
+_HAS_HEMI = re.compile(r"[NSEW]", re.I)
+_HAS_DEC = re.compile(r"\d\.\d")
+
+def _coord_spans(t: str) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """(DMS spans, decimal spans) worth running the coordinate patterns on."""
+    # Grow each maximal run outwards from a digit (leftwards via the reversed text), so the
+    # work stays linear even on long digit-free runs of whitespace.
+    dms, dec = [], []
+    n, rev = len(t), None
+    m = _DIGIT.search(t)
+    while m:
+        if rev is None:
+            rev = t[::-1]
+        s = n - _COORD_CH.match(rev, n - m.start()).end()
+        e = _COORD_CH.match(t, m.start()).end()
+        run = t[s:e]
+        if _HAS_HEMI.search(run):
+            dms.append((s, e))
+        if "." in run and _HAS_DEC.search(run):
+            dec.append((s, e))
+        m = _DIGIT.search(t, e)
+    return dms, dec
+
+def _finditer_spans(pat: re.Pattern, t: str, spans: List[Tuple[int, int]]):
+    # Same matches as pat.finditer(t) inside these spans: pos keeps lookbehinds/\b seeing the
+    # real text, and endpos = end + 1 leaves the one char of lookahead trailing assertions need.
+    for s, e in spans:
+        for m in pat.finditer(t, s, e + 1):
+            if m.start() >= e:
+                break
+            yield m
+
 def _collect_coord_candidates_with_pos(text: str) -> List[Dict]:
-    items: List[Dict] = []
     t = _norm_minus(text)
+    return _coord_candidates(t, *_coord_spans(t))
+
+def _coord_candidates(t: str, dms_spans: List[Tuple[int, int]], dec_spans: List[Tuple[int, int]],
+                      base: int = 0) -> List[Dict]:
+    """Candidates from the given spans of (minus-normalized) t, pos offset by base."""
+    items: List[Dict] = []
 
     # DMS candidates
-    for m in DMS_FLEX.finditer(t):
+    for m in _finditer_spans(DMS_FLEX, t, dms_spans):
         hemi = (m.group("h1") or m.group("h3") or "").upper()
         if hemi not in ("N","S","E","W"):
             continue
@@ -413,12 +945,12 @@ def _collect_coord_candidates_with_pos(text: str) -> List[Dict]:
         if (not is_lat) and not (-180 <= dec <= 180): continue
         items.append({
             "raw": raw, "dec": dec, "is_lat": is_lat,
-            "pos": m.start(), "nd_pref": _nd_pref(dec, is_lat),
+            "pos": base + m.start(), "nd_pref": _nd_pref(dec, is_lat),
             "quality": 2,  # DMS preferred
         })
 
     # Decimal-degree candidates
-    for m in DEC_ANY.finditer(t):
+    for m in _finditer_spans(DEC_ANY, t, dec_spans):
         raw = m.group(0).strip()
         if _is_obvious_township(raw):
             continue
@@ -447,48 +979,113 @@ def _collect_coord_candidates_with_pos(text: str) -> List[Dict]:
         if (not is_lat) and not (-180 <= dec <= 180): continue
         items.append({
             "raw": raw, "dec": dec, "is_lat": is_lat,
-            "pos": m.start(), "nd_pref": _nd_pref(dec, is_lat),
+            "pos": base + m.start(), "nd_pref": _nd_pref(dec, is_lat),
             "quality": 1,  # decimal
         })
 
     items.sort(key=lambda x: x["pos"])
     return items
 
+class PairPicker:
+    """Best lat+lon pair over candidates fed in position order.
+
+    Only pairs at most 25 apart in that order are scored; lat and lon each keep a window of
+    their last candidates, so every cross pair is scored once and state stays O(25).
+    score = weight(a) + weight(b) + proximity with weight = quality*10 + nd_pref*2; ties go to
+    the pair that comes first in position order.
+    """
+
+    def __init__(self):
+        self.k = 0
+        self.lats: deque = deque()
+        self.lons: deque = deque()
+        self.best: Optional[Tuple[str, str]] = None
+        self.best_key = None
+        self.first_lat: Optional[str] = None
+        self.first_lon: Optional[str] = None
+        self.max_w = {True: 0, False: 0}   # heaviest lat / lon weight seen so far
+
+    def feed(self, c: Dict) -> None:
+        k = self.k
+        self.k += 1
+        is_lat, raw, pos = c["is_lat"], c["raw"], c["pos"]
+        if is_lat and self.first_lat is None:
+            self.first_lat = raw
+        if not is_lat and self.first_lon is None:
+            self.first_lon = raw
+        for win in (self.lats, self.lons):
+            while win and win[0][0] < k - 25:
+                win.popleft()
+        # final guard: lat has only N/S and lon has only E/W (rejects mixed or wrong letter)
+        if _hemi_status(raw) not in (("LAT" if is_lat else "LON"), "NONE"):
+            return
+        w = c["quality"] * 10 + (2 if c["nd_pref"] else 0)
+        self.max_w[is_lat] = max(self.max_w[is_lat], w)
+        if self.best_key is not None and w + self.max_w[not is_lat] + 1.0 < self.best_key[0]:
+            # can't beat the current best even at distance 0 (max_w bounds the window's weights)
+            (self.lats if is_lat else self.lons).append((k, pos, w, raw))
+            return
+        best_key = self.best_key
+        for ib, pb, wb, rb in (self.lons if is_lat else self.lats):
+            dist = pos - pb if pos >= pb else pb - pos
+            score = float(w + wb) + ((1200 - dist) / 1200.0 if dist < 1200 else 0.0)
+            if best_key is None or score >= best_key[0]:
+                key = (score, -ib, -k)
+                if best_key is None or key > best_key:
+                    self.best = (raw, rb) if is_lat else (rb, raw)
+                    self.best_key = best_key = key
+        (self.lats if is_lat else self.lons).append((k, pos, w, raw))
+
+    def result(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.best:
+            return self.best
+        # Fallback: first valid lat and first valid lon
+        return self.first_lat, self.first_lon
+
+def _pick_lat_lon(cands: List[Dict]) -> Tuple[Optional[str], Optional[str]]:
+    picker = PairPicker()
+    for c in cands:
+        picker.feed(c)
+    return picker.result()
+
+# A run of coordinate-like text longer than this is cut at the chunk end rather than carried
+COORD_CARRY_MAX = 1 << 20
+
+class CoordScanner:
+    """Incremental _pair_best_lat_lon over text chunks (pages joined by "\n").
+
+    The trailing run of coordinate characters may continue in the next chunk, so it is
+    carried over (with the one char before it, for the patterns' look-behinds) instead of
+    being scanned; everything before it is final.
+    """
+
+    def __init__(self):
+        self.carry = ""
+        self.base = 0          # doc position of carry[0]
+        self.picker = PairPicker()
+
+    def feed(self, chunk: str, final: bool = False) -> None:
+        t = self.carry + _norm_minus(chunk)
+        cut = len(t)
+        if not final:
+            cut -= _COORD_CH.match(t[::-1]).end()
+            if len(t) - cut > COORD_CARRY_MAX:
+                cut = len(t)
+        dms, dec = _coord_spans(t)
+        dms = [sp for sp in dms if sp[0] < cut or cut == len(t)]
+        dec = [sp for sp in dec if sp[0] < cut or cut == len(t)]
+        for c in _coord_candidates(t, dms, dec, self.base):
+            self.picker.feed(c)
+        keep = max(0, cut - 1)
+        self.carry = t[keep:]
+        self.base += keep
+
+    def result(self) -> Tuple[Optional[str], Optional[str]]:
+        self.feed("", final=True)
+        return self.picker.result()
+
 def _pair_best_lat_lon(text: str) -> Tuple[Optional[str], Optional[str]]:
-    cands = _collect_coord_candidates_with_pos(text)
-    if not cands:
-        return None, None
-
-    # pick best lat+lon pair
-    best = (None, None, -1.0)
-    for i, a in enumerate(cands):
-        for j in range(max(0, i-25), min(len(cands), i+26)):
-            b = cands[j]
-            if a["is_lat"] == b["is_lat"]:
-                continue
-            dist = abs(a["pos"] - b["pos"])
-            score = 0.0
-            score += (a["quality"] + b["quality"]) * 10
-            score += (1 if a["nd_pref"] else 0) * 2
-            score += (1 if b["nd_pref"] else 0) * 2
-            score += max(0, 1200 - dist) / 1200.0
-            if score > best[2]:
-                lat_raw = a["raw"] if a["is_lat"] else b["raw"]
-                lon_raw = b["raw"] if a["is_lat"] else a["raw"]
-                # final guard: ensure lat has only N/S and lon has only E/W
-                if _hemi_status(lat_raw) not in ("LAT", "NONE"):   # reject mixed or lon-letter
-                    continue
-                if _hemi_status(lon_raw) not in ("LON", "NONE"):   # reject mixed or lat-letter
-                    continue
-                best = (lat_raw, lon_raw, score)
-
-    if best[0] and best[1]:
-        return best[0], best[1]
-
-    # Fallback: first valid lat and first valid lon
-    lat = next((x["raw"] for x in cands if x["is_lat"]), None)
-    lon = next((x["raw"] for x in cands if not x["is_lat"]), None)
-    return lat, lon
+    return _pick_lat_lon(_collect_coord_candidates_with_pos(text))
 # ---------- end coordinates ----------
 
 
@@ -561,13 +1158,122 @@ def clip_len(s, n):
     if s is None: return None
     s = str(s).strip()
     return s[:n]
-def normalize_all_date_fields(rec: Dict[str, Optional[str]], doc_text: str) -> None:
+def normalize_all_date_fields(rec: Dict[str, Optional[str]], doc_date: Optional[str]) -> None:
+    # doc_date: short_date_from_text() of the whole document, the fallback for every date field
     for k, v in list(rec.items()):
         if "date" in k.lower():
-            tok = short_date_from_text(v) or short_date_from_text(doc_text)
+            tok = short_date_from_text(v) or doc_date
             rec[k] = tok[:COL_LIMITS.get(k, 32)] if tok else None
 
-def parse_pdf(pdf_path: Path) -> Dict[str, Optional[str]]:
+def _tail_lines(s: str, n: int) -> str:
+    """Suffix of s starting at the n-th last line that has non-blank text (or all of s)."""
+    pos, seen = len(s), 0
+    while pos > 0:
+        nl = s.rfind("\n", 0, pos)
+        if s[nl+1:pos].strip():
+            seen += 1
+            if seen == n:
+                return s[nl+1:]
+        pos = nl
+    return s
+
+class FirstMatchScanner:
+    """First match of each pattern over text chunks (pages joined by "\n").
+
+    The fallback patterns can only run across a page break through whitespace between
+    tokens, and each keeps at most two tokens before the break, so the last three non-blank
+    lines of what has been seen are carried into the next search.
+    """
+
+    def __init__(self, pats: Dict[str, re.Pattern], carry_lines: int = 3):
+        self.todo = dict(pats)
+        self.found: Dict[str, Tuple] = {}
+        self.carry = ""
+        self.carry_lines = carry_lines
+
+    def feed(self, chunk: str) -> None:
+        if not self.todo:
+            return
+        t = self.carry + chunk
+        for key, pat in list(self.todo.items()):
+            m = pat.search(t)
+            if m:
+                self.found[key] = m.groups()
+                del self.todo[key]
+        self.carry = _tail_lines(t, self.carry_lines) if self.todo else ""
+
+    def group(self, key: str, n: int = 1) -> Optional[str]:
+        g = self.found.get(key)
+        return g[n - 1] if g else None
+
+DETAILS_RX = re.compile(r"(Stimul|Treat|Acidiz|Frac|Hydraulic|Proppant|Stage|Pressure|Rate|Volume)", re.I)
+DETAILS_MAX = 1200
+DETAILS_SPAN = 15       # lines taken from each keyword line onwards
+_WS = re.compile(r"\s+")
+
+def details_windows(plines: List[str], span: int = DETAILS_SPAN) -> Iterable[Tuple[int, int]]:
+    """Yield [start, end) line ranges around keyword lines, overlapping windows merged into one."""
+    start = end = -1
+    for i, ln in enumerate(plines):
+        if not DETAILS_RX.search(ln):
+            continue
+        if i < end:
+            end = min(len(plines), i + span)
+            continue
+        if end > 0:
+            yield start, end
+        start, end = i, min(len(plines), i + span)
+    if end > 0:
+        yield start, end
+
+class DetailsCollector:
+    """Unique per-page detail blocks in first-seen order, kept only up to the DETAILS_MAX budget."""
+
+    def __init__(self, budget: int = DETAILS_MAX):
+        self.budget = budget
+        self.blocks: Dict[str, None] = {}
+        self.size = 0           # len(" | ".join(blocks))
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.budget
+
+    def feed(self, plines: List[str]) -> None:
+        if self.full:
+            return
+        for s, e in details_windows(plines):
+            blk = _WS.sub(" ", " ".join(plines[s:e]).strip())
+            if blk not in self.blocks:
+                self.size += len(blk) + (3 if self.blocks else 0)
+                self.blocks[blk] = None
+                if self.full:
+                    return
+
+    def result(self) -> Optional[str]:
+        return (" | ".join(self.blocks))[:self.budget] if self.blocks else None
+
+# Fields copied straight from their label, then the ones parse_pdf post-processes itself
+LABEL_FIELDS = ["operator_company","address","date_stimulated","stimulated_formation","job_type",
+                "top_ft","bottom_ft","stimulation_stages","acid_percent","lbs_proppant"]
+SCAN_FIELDS = LABEL_FIELDS + ["api_number","volume","max_pressure","max_rate"]
+
+# RGX fallbacks plus DATE_PATS ("date0".."date2"), all searched over the whole document
+FALLBACK_PATS = {
+    **{k: RGX[k] for k in ("date","acid_inline","vol_inline","rate_inline","press_inline","stages_inline")},
+    **{f"date{i}": pat for i, pat in enumerate(DATE_PATS)},
+}
+
+def parse_pdf(pdf_path: Path, stream: bool = False) -> Dict[str, Optional[str]]:
+    # stream: pull pages from a generator so a long document is never held in memory at once
+    return parse_pages(iter_text_pages(pdf_path) if stream else extract_text_pages(pdf_path))
+
+def parse_pages(pages: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Field extraction over page texts, consumed one page at a time.
+
+    Every extractor keeps only the state it needs (see the *Scanner classes), so memory does
+    not grow with document length when pages come from a generator. Results are the same as
+    searching the joined document text.
+    """
     out = {k: None for k in [
         "operator_company","well_name_number","api_number","job_type","address",
         "longitude","latitude","date_stimulated","stimulated_formation",
@@ -576,26 +1282,35 @@ def parse_pdf(pdf_path: Path) -> Dict[str, Optional[str]]:
         "max_treatment_pressure_psi","max_treatment_rate_bbls_per_min","details"
     ]}
 
-    ocrd = ocr_pdf_if_needed(pdf_path)
-    pages = extract_text_pages(ocrd)
-    all_text = "\n".join(pages)
-    lines = page_lines(all_text)
-
-    out["well_name_number"] = extract_well_name(lines)
-
-    for key, pat in {
-        "operator_company": LP["operator_company"],
-        "address": LP["address"],
-        "date_stimulated": LP["date_stimulated"],
-        "stimulated_formation": LP["stimulated_formation"],
-        "job_type": LP["job_type"],
-        "top_ft": LP["top_ft"],
-        "bottom_ft": LP["bottom_ft"],
-        "stimulation_stages": LP["stimulation_stages"],
-        "acid_percent": LP["acid_percent"],
-        "lbs_proppant": LP["lbs_proppant"],
-    }.items():
-        v, _ = extract_value_near_label(lines, pat)
+    well = WellNameScanner()
+    labels = LabelScanner({k: LP[k] for k in SCAN_FIELDS})
+    coords = CoordScanner()
+    fallback = FirstMatchScanner(FALLBACK_PATS)
+    details = DetailsCollector()
+    for n, ptxt in enumerate(pages):
+        chunk = ptxt if n == 0 else "\n" + ptxt     # same text as "\n".join(pages)
+        with stage("coords"):
+            coords.feed(chunk)
+        with stage("fallback"):
+            fallback.feed(chunk)
+        with stage("lines"):
+            plines = page_lines(ptxt)
+        with stage("well_name"):
+            for ln in plines:
+                well.feed(ln)
+        with stage("labels"):
+            for ln in plines:
+                labels.feed(ln)
+        with stage("details"):
+            details.feed(plines)
+
+    with stage("well_name"):
+        out["well_name_number"] = well.result()
+
+    # All label fields in one pass over lines (first hit per field)
+    hits = labels.out
+    for key in LABEL_FIELDS:
+        v = hits[key]
         if v:
             if key in ("top_ft","bottom_ft","stimulation_stages","acid_percent","lbs_proppant"):
                 out[key] = only_num(v)
@@ -603,54 +1318,48 @@ def parse_pdf(pdf_path: Path) -> Dict[str, Optional[str]]:
                 out[key] = v
 
     # Coordinates: scan whole PDF and choose the best LAT/LON pair
-    lat_raw, lon_raw = _pair_best_lat_lon(all_text)
+    with stage("coords"):
+        lat_raw, lon_raw = coords.result()
     out["latitude"]  = lat_raw
     out["longitude"] = lon_raw
 
     # API Number
-    api_line, _ = extract_value_near_label(lines, LP["api_number"])
-    out["api_number"] = canonicalize_api(api_line)
+    out["api_number"] = canonicalize_api(hits["api_number"])
 
     # Volume (value + units)
     if not out["volume_value"]:
-        vv, uu = num_and_unit(extract_value_near_label(lines, LP["volume"])[0])
+        vv, uu = num_and_unit(hits["volume"])
         out["volume_value"], out["volume_units"] = vv, uu
 
     # Max pressure/rate
     if not out["max_treatment_pressure_psi"]:
-        out["max_treatment_pressure_psi"] = only_num(extract_value_near_label(lines, LP["max_pressure"])[0])
+        out["max_treatment_pressure_psi"] = only_num(hits["max_pressure"])
     if not out["max_treatment_rate_bbls_per_min"]:
-        out["max_treatment_rate_bbls_per_min"] = only_num(extract_value_near_label(lines, LP["max_rate"])[0])
+        out["max_treatment_rate_bbls_per_min"] = only_num(hits["max_rate"])
 
     # Fallbacks for other fields
     if not out["date_stimulated"]:
-        m = RGX["date"].search(all_text); out["date_stimulated"] = m.group(1) if m else None
+        out["date_stimulated"] = fallback.group("date")
     if not out["acid_percent"]:
-        m = RGX["acid_inline"].search(all_text); out["acid_percent"] = m.group(1) if m else None
+        out["acid_percent"] = fallback.group("acid_inline")
     if not out["volume_value"]:
-        m = RGX["vol_inline"].search(all_text)
-        if m:
-            out["volume_value"] = re.sub(r"[,\s]","",m.group(1))
-            out["volume_units"] = (m.group(2) or "").lower()
+        g = fallback.found.get("vol_inline")
+        if g:
+            out["volume_value"] = re.sub(r"[,\s]","",g[0])
+            out["volume_units"] = (g[1] or "").lower()
     if not out["max_treatment_rate_bbls_per_min"]:
-        m = RGX["rate_inline"].search(all_text); out["max_treatment_rate_bbls_per_min"] = re.sub(r"[,\s]","",m.group(1)) if m else None
+        v = fallback.group("rate_inline"); out["max_treatment_rate_bbls_per_min"] = re.sub(r"[,\s]","",v) if v else None
     if not out["max_treatment_pressure_psi"]:
-        m = RGX["press_inline"].search(all_text); out["max_treatment_pressure_psi"] = re.sub(r"[,\s]","",m.group(1)) if m else None
+        v = fallback.group("press_inline"); out["max_treatment_pressure_psi"] = re.sub(r"[,\s]","",v) if v else None
     if not out["stimulation_stages"]:
-        m = RGX["stages_inline"].search(all_text); out["stimulation_stages"] = m.group(1) if m else None
+        out["stimulation_stages"] = fallback.group("stages_inline")
 
     # Details
-    details = []
-    for ptxt in pages:
-        plines = page_lines(ptxt)
-        for i, ln in enumerate(plines):
-            if re.search(r"(Stimul|Treat|Acidiz|Frac|Hydraulic|Proppant|Stage|Pressure|Rate|Volume)", ln, re.I):
-                blk = " ".join(plines[i:i+15])
-                details.append(re.sub(r"\s+", " ", blk.strip()))
-    if details:
-        out["details"] = (" | ".join(dict.fromkeys(details)))[:1200]
-
-    normalize_all_date_fields(out, all_text)
+    out["details"] = details.result()
+
+    doc_date = next((normalize_date_token(fallback.group(f"date{i}"))
+                     for i in range(len(DATE_PATS)) if fallback.group(f"date{i}")), None)
+    normalize_all_date_fields(out, doc_date)
 
     for k, n in COL_LIMITS.items():
         if out.get(k):
@@ -666,12 +1375,263 @@ def to_int(x):
     try: return None if x in (None,"") else int(float(x))
     except: return None
 
-def iter_pdfs(root: Path):
+def _cprofile_path(dump_dir: str, pdf_path: Path) -> Path:
+    # stem plus a short hash of the full path: names stay readable and never collide across dirs
+    return Path(dump_dir) / f"{pdf_path.stem}_{hashlib.sha1(str(pdf_path).encode()).hexdigest()[:8]}.prof"
+
+def _parse_pdf_safe(pdf_path: Path, stream: bool = False, cprofile_dir: Optional[str] = None
+                    ) -> Tuple[Path, Optional[Dict[str, Optional[str]]], Optional[str], Dict[str, int], Dict[str, float]]:
+    # Worker entry point: never raises, so one bad PDF can't kill the batch.
+    # Also returns this file's counter deltas and stage times, since workers can't share
+    # OCR_STATS / PROFILE with the parent.
+    before = dict(OCR_STATS)
+    PROFILE["times"] = {}
+    prof = None
+    if cprofile_dir:
+        import cProfile
+        prof = cProfile.Profile()
+    t0 = time.perf_counter()
+    try:
+        if prof:
+            prof.enable()
+        rec, err = parse_pdf(pdf_path, stream=stream), None
+    except Exception as e:
+        rec, err = None, f"{type(e).__name__}: {e}"
+    finally:
+        if prof:
+            prof.disable()
+    times = PROFILE["times"]
+    if PROFILE["on"]:
+        times["total"] = time.perf_counter() - t0
+    if prof:
+        prof.dump_stats(str(_cprofile_path(cprofile_dir, pdf_path)))
+    return pdf_path, rec, err, {k: OCR_STATS[k] - before.get(k, 0) for k in OCR_STATS}, times
+
+def _init_worker(cache_dir: Optional[str], max_mb: float, profile: bool) -> None:
+    configure_ocr_cache(cache_dir, max_mb)
+    PROFILE["on"] = profile
+
+def _parse_isolated(f: Path, parse, initargs: Tuple):
+    # One file in its own single-worker pool, so a crash there can only be this file's
+    with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=initargs) as pool:
+        try:
+            return pool.submit(parse, f).result()
+        except BrokenProcessPool as e:
+            return f, None, f"worker process died (killed or crashed): {e}", {}, {}
+
+def iter_parsed(files: List[Path], workers: int = 1, stream: bool = False, cprofile_dir: Optional[str] = None):
+    """Yield (path, record, error, stats, stage_times) in input order; parses in a process pool when workers > 1.
+
+    A worker that dies outright (OOM kill, segfault) breaks the whole pool. The files it had in
+    flight are then re-parsed one at a time, so only the one that crashes again is reported
+    failed, and the rest of the batch continues in a fresh pool.
+    """
+    if workers <= 1:
+        for f in files:
+            yield _parse_pdf_safe(f, stream, cprofile_dir)
+        return
+    parse = partial(_parse_pdf_safe, stream=stream, cprofile_dir=cprofile_dir)
+    initargs = (OCR_CACHE["dir"], OCR_CACHE["max_bytes"] / (1024 * 1024), PROFILE["on"])
+    todo = deque(files)
+    while todo:
+        suspects = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            # a bounded window of submissions, handed back in order as soon as the head is ready
+            inflight = deque()
+            while todo or inflight:
+                while todo and len(inflight) < 2 * workers:
+                    f = todo.popleft()
+                    inflight.append((f, pool.submit(parse, f)))
+                f, fut = inflight[0]
+                try:
+                    res = fut.result()
+                except BrokenProcessPool:
+                    suspects = list(inflight)
+                    break
+                inflight.popleft()
+                yield res
+        for f, fut in suspects:
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                yield fut.result()
+            else:
+                yield _parse_isolated(f, parse, initargs)
+
+def row_params(rec: Dict[str, Optional[str]]) -> Tuple:
+    """Record -> DB values in WELL_COLS order."""
+    return (
+        rec.get("operator_company"),
+        rec.get("well_name_number"),
+        rec.get("api_number"),
+        rec.get("job_type"),
+        rec.get("address"),
+        rec.get("longitude"),
+        rec.get("latitude"),
+        rec.get("date_stimulated"),
+        rec.get("stimulated_formation"),
+        to_float(rec.get("top_ft")),
+        to_float(rec.get("bottom_ft")),
+        to_int(rec.get("stimulation_stages")),
+        to_float(rec.get("volume_value")),
+        (rec.get("volume_units") or None),
+        rec.get("treatment_type"),
+        to_float(rec.get("acid_percent")),
+        to_float(rec.get("lbs_proppant")),
+        to_float(rec.get("max_treatment_pressure_psi")),
+        to_float(rec.get("max_treatment_rate_bbls_per_min")),
+        rec.get("details"),
+    )
+
+def _load_data_field(v) -> str:
+    # MySQL LOAD DATA default format: tab-separated, backslash escapes, \N for NULL
+    if v is None:
+        return "\\N"
+    return (str(v).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+class RecordWriter:
+    """Buffers parsed records and writes them, with their manifest entries, to the DB.
+
+    Modes:
+      row        one autocommitted UPSERT per record (the old behaviour)
+      batch      executemany per `batch_size` records inside one transaction
+      load-data  LOAD DATA LOCAL INFILE from a temp file per batch, inside one transaction
+    """
+
+    MODES = ("row", "batch", "load-data")
+
+    def __init__(self, conn, mode: str = "batch", batch_size: int = 500):
+        if mode not in self.MODES:
+            raise ValueError(f"unknown write mode: {mode}")
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.buf: List[Tuple[Dict, Tuple]] = []
+        self.inserted = 0
+        self.updated = 0
+        self.write_secs = 0.0
+        if mode != "row":
+            try:
+                # MySQL 8 caches information_schema.tables (AUTO_INCREMENT included) for a day by default
+                self.cur.execute("SET SESSION information_schema_stats_expiry = 0")
+            except Exception:
+                pass    # older servers / MariaDB: no such variable, and no caching either
+
+    def add(self, entry: Dict, rec: Dict[str, Optional[str]]) -> None:
+        self.buf.append((entry, row_params(rec)))
+        if self.mode == "row" or len(self.buf) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buf:
+            return
+        t0 = time.perf_counter()
+        if self.mode == "row":
+            self._write_rows()
+        else:
+            self._write_batch()
+        self.write_secs += time.perf_counter() - t0
+        self.buf = []
+
+    def close(self) -> None:
+        self.flush()
+        self.cur.close()
+
+    def rows_per_sec(self) -> float:
+        n = self.inserted + self.updated
+        return n / self.write_secs if self.write_secs > 0 else 0.0
+
+    def _write_rows(self) -> None:
+        for entry, params in self.buf:
+            self.cur.execute(UPSERT_SQL, (entry["row_id"], *params))
+            if entry["row_id"] is None:
+                entry["row_id"] = self.cur.lastrowid
+                self.inserted += 1
+            else:
+                self.updated += 1
+            save_manifest_entry(self.cur, entry)
+
+    def _write_batch(self) -> None:
+        new = [e for e, _ in self.buf if e["row_id"] is None]
+        self.conn.start_transaction()
+        try:
+            if new:
+                # Reserve ids up front so the manifest knows every row id without per-row lastrowid.
+                next_id = self._next_id()
+                for i, e in enumerate(new):
+                    e["row_id"] = next_id + i
+            rows = [(e["row_id"], *params) for e, params in self.buf]
+            if self.mode == "load-data":
+                self._load_data(rows)
+            else:
+                self.cur.executemany(UPSERT_SQL, rows)
+            self.cur.executemany(MANIFEST_UPSERT_SQL, [manifest_params(e) for e, _ in self.buf])
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            for e in new:
+                e["row_id"] = None
+            raise
+        self.inserted += len(new)
+        self.updated += len(self.buf) - len(new)
+
+    def _next_id(self) -> int:
+        # FOR UPDATE locks the end of the PK index, so a concurrent writer can't take the ids.
+        self.cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {TABLE} FOR UPDATE")
+        next_id = int(self.cur.fetchone()[0]) + 1
+        # MAX(id)+1 alone reissues the ids of rows deleted from the end of the table, which stale
+        # manifest entries may still point at; AUTO_INCREMENT never goes back down.
+        self.cur.execute(
+            "SELECT AUTO_INCREMENT FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s",
+            (TABLE,),
+        )
+        row = self.cur.fetchone()
+        if row and row[0]:
+            next_id = max(next_id, int(row[0]))
+        return next_id
+
+    def _load_data(self, rows: List[Tuple]) -> None:
+        fd, tmp = tempfile.mkstemp(prefix="wells_load_", suffix=".tsv")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as fh:
+                for r in rows:
+                    fh.write("\t".join(_load_data_field(v) for v in r) + "\n")
+            # Load into a staging table, then upsert like UPSERT_SQL does: REPLACE INTO wells would
+            # delete and re-insert changed rows, nulling the scraper's enrichment columns.
+            # (CREATE/DROP TEMPORARY TABLE don't commit, so this stays inside the batch transaction.)
+            self.cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {LOAD_STAGE_TABLE}")
+            self.cur.execute(f"CREATE TEMPORARY TABLE {LOAD_STAGE_TABLE} LIKE {TABLE}")
+            self.cur.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {LOAD_STAGE_TABLE} "
+                f"CHARACTER SET utf8mb4 (id, {', '.join(WELL_COLS)})",
+                (tmp,),
+            )
+            self.cur.execute(LOAD_MERGE_SQL)
+            self.cur.execute(f"DROP TEMPORARY TABLE {LOAD_STAGE_TABLE}")
+        finally:
+            os.unlink(tmp)
+
+def iter_pdfs(root: Path, manifest: Optional[Dict[str, Dict]] = None, touched: Optional[List[Dict]] = None):
+    """Yield PDFs under root; with a manifest, only new or changed ones.
+
+    Yielded files get their fresh entry stored in manifest[key]; unchanged files whose
+    size/mtime moved are appended to `touched` so the caller can refresh them.
+    """
     for p in sorted(root.rglob("*")):
         if p.is_file() and p.suffix.lower() == ".pdf":
             if p.name.startswith("ocr_"): 
                 continue
-            yield p
+            if manifest is None:
+                yield p
+                continue
+            entry, changed = manifest_check(p, manifest)
+            old = manifest.get(entry["path"])
+            if changed:
+                manifest[entry["path"]] = entry
+                yield p
+            elif touched is not None and (old["size_bytes"], old["mtime"]) != (entry["size_bytes"], entry["mtime"]):
+                touched.append(entry)
 
 def main():
     ap = argparse.ArgumentParser()
@@ -679,11 +1639,40 @@ def main():
     g.add_argument("--pdf-path", nargs="+", help="One or more PDF files")
     g.add_argument("--pdf-dir", type=str, help="Directory of PDFs (recursive)")
     ap.add_argument("--out-csv", type=str, help="Optional CSV output path")
+    ap.add_argument("--force", action="store_true", help="Re-parse every PDF, ignoring the ingestion manifest")
+    ap.add_argument("--write-mode", choices=RecordWriter.MODES, default="batch",
+                    help="DB write strategy: row (one statement each), batch (executemany), load-data (LOAD DATA LOCAL INFILE)")
+    ap.add_argument("--batch-size", type=int, default=500, help="Records per transaction in batch/load-data mode")
+    ap.add_argument("--workers", type=int, default=1, help="Parse PDFs in N worker processes (default 1 = serial)")
+    ap.add_argument("--stream", action="store_true",
+                    help="Parse page-at-a-time so memory stays bounded on very long PDFs")
+    ap.add_argument("--ocr-cache-dir", type=str, default=OCR_CACHE["dir"],
+                    help="Persistent OCR cache directory ('' disables caching)")
+    ap.add_argument("--ocr-cache-max-mb", type=float, default=OCR_CACHE["max_bytes"] / (1024 * 1024),
+                    help="OCR cache size cap; least recently used entries are evicted")
+    ap.add_argument("--profile", action="store_true",
+                    help="Time each parser stage per file and write a report to --profile-dir")
+    ap.add_argument("--profile-dir", type=str, default="profile",
+                    help="Where --profile writes stage_times.csv, stage_summary.json and cProfile dumps")
+    ap.add_argument("--profile-top", type=int, default=0,
+                    help="With --profile, keep cProfile dumps (.prof) for the N slowest PDFs")
     args = ap.parse_args()
-
-    conn = db_conn()
+    configure_ocr_cache(args.ocr_cache_dir, args.ocr_cache_max_mb)
+    PROFILE["on"] = args.profile
+    cprofile_dir = None
+    if args.profile and args.profile_top > 0:
+        cprofile_dir = str(Path(args.profile_dir) / "cprofile")
+        Path(cprofile_dir).mkdir(parents=True, exist_ok=True)
+    run_stages: Dict[str, float] = {}
+    per_file: List[Tuple[Path, Dict[str, float]]] = []
+    kept: List[Tuple[float, str]] = []     # min-heap of (total secs, dump path) for the slowest N
+
+    conn = db_conn(allow_local_infile=True) if args.write_mode == "load-data" else db_conn()
     ensure_table(conn)
+    ensure_manifest(conn)
     cur = conn.cursor()
+    manifest = load_manifest(conn)
+    touched: List[Dict] = []
 
     if args.pdf_path:
         files = [Path(p) for p in args.pdf_path]
@@ -694,48 +1683,67 @@ def main():
         root = Path(args.pdf_dir)
         if not root.exists():
             print(f"ERR: dir not found: {root}", file=sys.stderr); sys.exit(2)
-        files = list(iter_pdfs(root))
+        t0 = time.perf_counter()
+        files = list(iter_pdfs(root, None if args.force else manifest, touched))
+        run_stages["manifest_scan"] = time.perf_counter() - t0
+
+    if args.pdf_path or args.force:
+        # re-parse everything requested, but still overwrite the row each file produced last time
+        for p in files:
+            entry, _ = manifest_check(p, manifest)
+            manifest[entry["path"]] = entry
+    for entry in touched:
+        save_manifest_entry(cur, entry)
+    print(f"Manifest: {len(files)} PDF(s) to parse, {len(touched)} unchanged but touched")
 
     rows = []
-    inserted = 0
+    failed = 0
     total = len(files)
-    for idx, f in enumerate(files, start=1):
-        rec = parse_pdf(f)
-        rows.append(rec)
-        cur.execute(INSERT_SQL, (
-            rec.get("operator_company"),
-            rec.get("well_name_number"),
-            rec.get("api_number"),
-            rec.get("job_type"),
-            rec.get("address"),
-            rec.get("longitude"),
-            rec.get("latitude"),
-            rec.get("date_stimulated"),
-            rec.get("stimulated_formation"),
-            to_float(rec.get("top_ft")),
-            to_float(rec.get("bottom_ft")),
-            to_int(rec.get("stimulation_stages")),
-            to_float(rec.get("volume_value")),
-            (rec.get("volume_units") or None),
-            rec.get("treatment_type"),
-            to_float(rec.get("acid_percent")),
-            to_float(rec.get("lbs_proppant")),
-            to_float(rec.get("max_treatment_pressure_psi")),
-            to_float(rec.get("max_treatment_rate_bbls_per_min")),
-            rec.get("details"),
-        ))
-        inserted += 1
-        print(f"({idx}/{total}) scanned: {f.name}")
-
-    print(f"Inserted total rows: {inserted}")
+    stats = {k: 0 for k in OCR_STATS}
+    writer = RecordWriter(conn, args.write_mode, args.batch_size)
+    try:
+        for idx, (f, rec, err, fstats, ftimes) in enumerate(
+                iter_parsed(files, args.workers, args.stream, cprofile_dir), start=1):
+            for k, v in fstats.items():
+                stats[k] = stats.get(k, 0) + v
+            if args.profile:
+                per_file.append((f, ftimes))
+            if cprofile_dir:
+                heapq.heappush(kept, (ftimes.get("total", 0.0), str(_cprofile_path(cprofile_dir, f))))
+                if len(kept) > args.profile_top:
+                    _, drop = heapq.heappop(kept)
+                    if os.path.exists(drop):
+                        os.unlink(drop)
+            if err:
+                failed += 1
+                print(f"({idx}/{total}) FAILED: {f.name}: {err}", file=sys.stderr)
+                continue
+            rows.append(rec)
+            writer.add(manifest[manifest_key(f)], rec)
+            print(f"({idx}/{total}) scanned: {f.name}")
+    finally:
+        writer.close()      # flush the buffered batch even if the run dies part-way
+
+    print(f"Inserted total rows: {writer.inserted}")
+    print(f"Updated total rows: {writer.updated}")
+    print(f"DB write ({writer.mode}): {writer.inserted + writer.updated} rows in {writer.write_secs:.2f}s "
+          f"({writer.rows_per_sec():.1f} rows/sec)")
+    if failed:
+        print(f"Failed files: {failed}", file=sys.stderr)
+    if OCR_CACHE["dir"]:
+        print(f"OCR cache: {stats['ocr_cache_hit']} hit / {stats['ocr_cache_miss']} miss ({OCR_CACHE['dir']})")
+    if args.profile:
+        run_stages["db_write"] = writer.write_secs
+        summary = write_profile_report(Path(args.profile_dir), per_file, run_stages)
+        print(f"Profile ({summary['files']} files) -> {args.profile_dir}")
+        for k, v in sorted(summary["stages"].items(), key=lambda kv: -kv[1]["sum"]):
+            print(f"  {k:<12} sum {v['sum']:8.2f}s  p50 {v['p50']*1000:8.1f} ms  p95 {v['p95']*1000:8.1f} ms")
+        for k, v in run_stages.items():
+            print(f"  {k:<12} sum {v:8.2f}s  (whole run)")
 
     if args.out_csv:
         df = pd.DataFrame(rows)
-        cols = ["operator_company","well_name_number","api_number","job_type","address",
-                "longitude","latitude","date_stimulated","stimulated_formation",
-                "top_ft","bottom_ft","stimulation_stages","volume_value","volume_units",
-                "treatment_type","acid_percent","lbs_proppant",
-                "max_treatment_pressure_psi","max_treatment_rate_bbls_per_min","details"]
+        cols = WELL_COLS
         for c in cols:
             if c not in df.columns: df[c] = None
         df = df[cols]
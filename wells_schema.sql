@@ -35,5 +35,43 @@ CREATE TABLE IF NOT EXISTS wells (
   oil_bbl INT DEFAULT NULL,
   oil_desc VARCHAR(255) DEFAULT NULL,
   gas_bbl INT DEFAULT NULL,
-  gas_desc VARCHAR(255) DEFAULT NULL
-);
\ No newline at end of file
+  gas_desc VARCHAR(255) DEFAULT NULL,
+
+  -- change marker for the webapp's cached GeoJSON (bumped by inserts and enrichment updates)
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+  -- update_well(s) match on well name; scraping dedupes by API number
+  KEY idx_wells_api (api_number),
+  KEY idx_wells_name (well_name_number)
+);
+
+-- Ingestion manifest used by wells_preprocessing.py to skip unchanged PDFs
+CREATE TABLE IF NOT EXISTS wells_ingest_manifest (
+  path VARCHAR(768) PRIMARY KEY,
+  size_bytes BIGINT,
+  mtime DOUBLE,
+  content_sha256 CHAR(64),
+  parser_version VARCHAR(32),
+  row_id BIGINT UNSIGNED,
+  ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Checkpointed enrichment runs (test_pipeline.py --resume / --retry-failed)
+CREATE TABLE IF NOT EXISTS scrape_runs (
+  run_id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  finished_at TIMESTAMP NULL DEFAULT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scrape_run_wells (
+  run_id INT UNSIGNED NOT NULL,
+  well_key VARCHAR(300) NOT NULL,
+  api_number VARCHAR(32),
+  well_name_number VARCHAR(255),
+  state ENUM('pending','done','failed','not_found') NOT NULL DEFAULT 'pending',
+  attempts INT NOT NULL DEFAULT 0,
+  last_error TEXT,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (run_id, well_key),
+  KEY idx_run_state (run_id, state)
+);